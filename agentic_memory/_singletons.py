@@ -0,0 +1,59 @@
+"""Process-wide shared embedding models and ChromaDB clients.
+
+Loading a SentenceTransformer model and opening a persistent Chroma client
+are the slowest parts of start-up. Every retriever in the process shares
+them through these memoized factories instead of loading its own copy.
+"""
+
+import os
+from functools import lru_cache
+
+import chromadb
+from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+
+# Tokenizer worker threads fight with our own thread pools and warn after fork
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+
+# Embedding backends: "torch" runs the SentenceTransformer model; "onnx" runs
+# Chroma's bundled ONNX export of all-MiniLM-L6-v2 on onnxruntime (a Chroma
+# dependency), which is faster on CPU and does not load PyTorch weights.
+EMBEDDING_BACKENDS = ("torch", "onnx")
+_ONNX_MODELS = ("all-MiniLM-L6-v2", "sentence-transformers/all-MiniLM-L6-v2")
+
+
+@lru_cache(maxsize=None)
+def get_embedder(model_name: str = "all-MiniLM-L6-v2", backend: str = "torch"):
+    """Shared Chroma embedding function for a sentence transformer model."""
+    if backend == "onnx":
+        if model_name not in _ONNX_MODELS:
+            raise ValueError(f"ONNX embedding backend only supports all-MiniLM-L6-v2, got: {model_name}")
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+        return ONNXMiniLM_L6_V2()
+    if backend != "torch":
+        raise ValueError(f"Unknown embedding backend: {backend} (expected one of {EMBEDDING_BACKENDS})")
+    return SentenceTransformerEmbeddingFunction(model_name=model_name)
+
+
+@lru_cache(maxsize=4096)
+def embed_query(model_name: str, query: str, backend: str = "torch") -> tuple:
+    """Memoized query embedding; agents often repeat the exact same search phrase.
+
+    Returned as a tuple so cached values cannot be mutated by callers.
+    """
+    return tuple(float(x) for x in get_embedder(model_name, backend)([query])[0])
+
+
+@lru_cache(maxsize=None)
+def get_client(persist_directory: str = "./chroma_db"):
+    """Shared persistent Chroma client for a storage directory."""
+    return chromadb.PersistentClient(path=persist_directory)
+
+
+@lru_cache(maxsize=None)
+def get_retriever(collection_name: str = "memories", model_name: str = "all-MiniLM-L6-v2",
+                  persist_directory: str = "./chroma_db", embedding_backend: str = "torch"):
+    """Shared ChromaRetriever for a collection."""
+    from .retrievers import ChromaRetriever
+    return ChromaRetriever(collection_name=collection_name, model_name=model_name,
+                           persist_directory=persist_directory, embedding_backend=embedding_backend)
@@ -1,29 +1,198 @@
-from typing import Dict, Optional, Literal, Any
+from typing import Dict, Optional, Literal, Any, Callable, List, Tuple
 import os
 import json
+import asyncio
+import hashlib
+import random
+import sqlite3
+import threading
+import time
 from abc import ABC, abstractmethod
-from litellm import completion
+from collections import OrderedDict
+from litellm import completion, acompletion
+import aiohttp
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class TokenBucket:
+    """Client-side pacer for provider requests-per-minute and tokens-per-minute limits.
+
+    Both buckets start full (one minute of budget) and refill continuously on
+    a monotonic clock. Callers reserve one request plus an estimated token
+    count before each call and sleep until enough budget is available, so
+    bursts are smoothed before the provider answers with 429s.
+
+    Args:
+        rate_rpm: Requests per minute, or None for no request limit
+        rate_tpm: Tokens per minute, or None for no token limit
+    """
+
+    def __init__(self, rate_rpm: Optional[float] = None, rate_tpm: Optional[float] = None):
+        self.rate_rpm = rate_rpm
+        self.rate_tpm = rate_tpm
+        self._requests = float(rate_rpm) if rate_rpm else 0.0
+        self._tokens = float(rate_tpm) if rate_tpm else 0.0
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def estimate_tokens(prompt: str, max_output_tokens: int = 1000) -> int:
+        """Rough token estimate for a request (~4 characters per prompt token plus output budget)."""
+        return len(prompt) // 4 + max_output_tokens
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed_minutes = (now - self._last_refill) / 60
+        self._last_refill = now
+        if self.rate_rpm:
+            self._requests = min(self.rate_rpm, self._requests + elapsed_minutes * self.rate_rpm)
+        if self.rate_tpm:
+            self._tokens = min(self.rate_tpm, self._tokens + elapsed_minutes * self.rate_tpm)
+
+    def _reserve(self, tokens: int) -> float:
+        """Take budget if available; otherwise return seconds to wait before retrying."""
+        with self._lock:
+            self._refill()
+            # A single request larger than the whole bucket is allowed once the bucket is full
+            tokens = min(tokens, self.rate_tpm) if self.rate_tpm else 0
+            wait = 0.0
+            if self.rate_rpm and self._requests < 1:
+                wait = max(wait, (1 - self._requests) / self.rate_rpm * 60)
+            if self.rate_tpm and self._tokens < tokens:
+                wait = max(wait, (tokens - self._tokens) / self.rate_tpm * 60)
+            if wait > 0:
+                return wait
+            if self.rate_rpm:
+                self._requests -= 1
+            if self.rate_tpm:
+                self._tokens -= tokens
+            return 0.0
+
+    def acquire(self, tokens: int = 0):
+        """Block until one request and ``tokens`` tokens are available."""
+        while True:
+            wait = self._reserve(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0):
+        """Async variant of acquire() that sleeps without blocking the event loop."""
+        while True:
+            wait = self._reserve(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def calibrate(self, remaining_requests: Optional[int] = None, remaining_tokens: Optional[int] = None):
+        """Sync local budget with the provider's view (e.g. x-ratelimit-remaining-* headers).
+
+        The provider's remaining counts reflect actual token usage, so this also
+        returns over-estimated capacity to the bucket.
+        """
+        with self._lock:
+            self._refill()
+            if self.rate_rpm and remaining_requests is not None:
+                self._requests = min(float(self.rate_rpm), float(remaining_requests))
+            if self.rate_tpm and remaining_tokens is not None:
+                self._tokens = min(float(self.rate_tpm), float(remaining_tokens))
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+_RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether an exception carries a rate-limit/transient HTTP status."""
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    return status in _RETRYABLE_STATUSES
+
+def _backoff_delay(attempt: int, min_wait: float = 1.0, max_wait: float = 60.0) -> float:
+    """Random exponential backoff ("full jitter") for the given 0-based attempt."""
+    return max(min_wait, random.uniform(0, min(max_wait, min_wait * (2 ** attempt))))
+
+# Process-wide HTTP clients shared by every controller with the same endpoint,
+# so rebuilding a controller reuses the existing connection pool
+_OPENAI_CLIENTS: Dict[Tuple[str, Optional[str]], Any] = {}
+_SGLANG_SESSIONS: Dict[str, requests.Session] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+def _get_openai_client(api_key: str, base_url: Optional[str] = None):
+    """Memoized sync OpenAI client for (api_key, base_url)."""
+    key = (api_key, base_url)
+    with _CLIENTS_LOCK:
+        client = _OPENAI_CLIENTS.get(key)
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI(api_key=api_key, base_url=base_url)
+            _OPENAI_CLIENTS[key] = client
+        return client
+
+def _get_sglang_session(base_url: str) -> requests.Session:
+    """Memoized pooled keep-alive session for an SGLang server.
+
+    Transient errors are retried with backoff by the mounted adapter.
+    """
+    with _CLIENTS_LOCK:
+        session = _SGLANG_SESSIONS.get(base_url)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+            retries = Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(["POST"]),
+                raise_on_status=False
+            )
+            session.mount(base_url, HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=retries))
+            _SGLANG_SESSIONS[base_url] = session
+        return session
+
+# JSON schema type -> factory for its empty value (fresh containers per call)
+_EMPTY_BY_TYPE: Dict[str, Callable[[], Any]] = {
+    "array": list,
+    "string": str,
+    "object": dict,
+    "number": int,
+    "integer": int,
+    "boolean": bool,
+}
 
 class BaseLLMController(ABC):
+    # Upper bound on in-flight async requests per controller
+    max_concurrent: int = 16
+    _async_semaphore: Optional[asyncio.Semaphore] = None
+    # Set by LLMController when client-side rate limiting is enabled
+    rate_limiter: Optional[TokenBucket] = None
+    # id(response_format) -> (response_format, serialized empty response)
+    _empty_cache: Optional[Dict[int, Tuple[dict, str]]] = None
+    # Whether get_completion()/aget_completion() accept an on_token streaming callback
+    supports_streaming: bool = False
+
     @abstractmethod
     def get_completion(self, prompt: str) -> str:
         """Get completion from LLM"""
         pass
 
+    async def aget_completion(self, prompt: str, response_format: dict, temperature: float = 1.0) -> str:
+        """Async completion. Backends without a native async client run the sync call in a thread."""
+        async with self._async_limit():
+            return await asyncio.to_thread(self.get_completion, prompt, response_format, temperature)
+
+    async def aclose(self):
+        """Release async client resources (connection pools). Safe to call more than once."""
+
+    def _async_limit(self) -> asyncio.Semaphore:
+        """Semaphore capping concurrent async requests (created lazily)."""
+        if self._async_semaphore is None:
+            self._async_semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._async_semaphore
+
     def _generate_empty_value(self, schema_type: str, schema_items: dict = None) -> Any:
         """Generate empty value based on JSON schema type."""
-        if schema_type == "array":
-            return []
-        elif schema_type == "string":
-            return ""
-        elif schema_type == "object":
-            return {}
-        elif schema_type == "number" or schema_type == "integer":
-            return 0
-        elif schema_type == "boolean":
-            return False
-        return None
+        factory = _EMPTY_BY_TYPE.get(schema_type)
+        return factory() if factory is not None else None
 
     def _generate_empty_response(self, response_format: dict) -> dict:
         """Generate empty response matching the expected schema."""
@@ -42,20 +211,36 @@ class BaseLLMController(ABC):
 
         return result
 
+    def _empty_json(self, response_format: dict) -> str:
+        """Serialized empty response for a schema, built once per response_format object."""
+        if self._empty_cache is None:
+            self._empty_cache = {}
+        key = id(response_format)
+        entry = self._empty_cache.get(key)
+        # Keep a reference to the schema so its id cannot be recycled while cached
+        if entry is None or entry[0] is not response_format:
+            entry = (response_format, json.dumps(self._generate_empty_response(response_format)))
+            self._empty_cache[key] = entry
+        return entry[1]
+
 class OpenAIController(BaseLLMController):
+    supports_streaming = True
+
     def __init__(self, model: str = "gpt-4", api_key: Optional[str] = None):
         try:
-            from openai import OpenAI
+            from openai import AsyncOpenAI
             self.model = model
             if api_key is None:
                 api_key = os.getenv('OPENAI_API_KEY')
             if api_key is None:
                 raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
-            self.client = OpenAI(api_key=api_key)
+            self.client = _get_openai_client(api_key)
+            # The async client's pool is bound to the event loop it first runs on, so it stays per-controller
+            self.async_client = AsyncOpenAI(api_key=api_key)
         except ImportError:
             raise ImportError("OpenAI package not found. Install it with: pip install openai")
 
-    def get_completion(self, prompt: str, response_format: dict, temperature: float = 1.0, max_tokens: int = None) -> str:
+    def _build_request(self, prompt: str, response_format: dict, temperature: float, max_tokens: Optional[int]) -> dict:
         # Build kwargs dynamically based on model type
         kwargs = {
             "model": self.model,
@@ -74,8 +259,82 @@ class OpenAIController(BaseLLMController):
             else:
                 kwargs["max_tokens"] = max_tokens
 
-        response = self.client.chat.completions.create(**kwargs)
-        return response.choices[0].message.content
+        return kwargs
+
+    def _calibrate_rate_limiter(self, headers):
+        """Feed OpenAI's x-ratelimit-remaining-* headers back into the rate limiter."""
+        def _header_int(name):
+            value = headers.get(name)
+            return int(value) if value is not None and str(value).isdigit() else None
+
+        self.rate_limiter.calibrate(
+            remaining_requests=_header_int("x-ratelimit-remaining-requests"),
+            remaining_tokens=_header_int("x-ratelimit-remaining-tokens")
+        )
+
+    @staticmethod
+    def _delta_text(chunk) -> str:
+        """Text carried by one streamed chunk (empty for role/finish chunks)."""
+        if not chunk.choices:
+            return ""
+        return chunk.choices[0].delta.content or ""
+
+    def get_completion(self, prompt: str, response_format: dict, temperature: float = 1.0, max_tokens: int = None,
+                       on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Get a completion.
+
+        If on_token is given the response is streamed: each text delta is passed
+        to on_token as it arrives, and the full text is still returned.
+        """
+        kwargs = self._build_request(prompt, response_format, temperature, max_tokens)
+        if on_token is not None:
+            kwargs["stream"] = True
+        if self.rate_limiter is None:
+            response = self.client.chat.completions.create(**kwargs)
+        else:
+            raw = self.client.chat.completions.with_raw_response.create(**kwargs)
+            self._calibrate_rate_limiter(raw.headers)
+            response = raw.parse()
+
+        if on_token is None:
+            return response.choices[0].message.content
+
+        parts = []
+        for chunk in response:
+            delta = self._delta_text(chunk)
+            if delta:
+                parts.append(delta)
+                on_token(delta)
+        return "".join(parts)
+
+    async def aget_completion(self, prompt: str, response_format: dict, temperature: float = 1.0, max_tokens: int = None,
+                              on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Async variant of get_completion()."""
+        kwargs = self._build_request(prompt, response_format, temperature, max_tokens)
+        if on_token is not None:
+            kwargs["stream"] = True
+        async with self._async_limit():
+            if self.rate_limiter is None:
+                response = await self.async_client.chat.completions.create(**kwargs)
+            else:
+                raw = await self.async_client.chat.completions.with_raw_response.create(**kwargs)
+                self._calibrate_rate_limiter(raw.headers)
+                response = raw.parse()
+
+            if on_token is None:
+                return response.choices[0].message.content
+
+            parts = []
+            async for chunk in response:
+                delta = self._delta_text(chunk)
+                if delta:
+                    parts.append(delta)
+                    on_token(delta)
+            return "".join(parts)
+
+    async def aclose(self):
+        """Close the async client's connection pool."""
+        await self.async_client.close()
 
 class OllamaController(BaseLLMController):
     def __init__(self, model: str = "llama2"):
@@ -94,8 +353,22 @@ class OllamaController(BaseLLMController):
             )
             return response.choices[0].message.content
         except Exception as e:
-            empty_response = self._generate_empty_response(response_format)
-            return json.dumps(empty_response)
+            return self._empty_json(response_format)
+
+    async def aget_completion(self, prompt: str, response_format: dict, temperature: float = 1.0) -> str:
+        try:
+            async with self._async_limit():
+                response = await acompletion(
+                    model="ollama_chat/{}".format(self.model),
+                    messages=[
+                        {"role": "system", "content": "You must respond with a JSON object."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format=response_format,
+                )
+            return response.choices[0].message.content
+        except Exception as e:
+            return self._empty_json(response_format)
 
 class SGLangController(BaseLLMController):
     """LLM controller for SGLang server using HTTP requests.
@@ -108,45 +381,158 @@ class SGLangController(BaseLLMController):
         sglang_host: SGLang server host URL (default: "http://localhost")
         sglang_port: SGLang server port (default: 30000)
     """
+    # Temperature for the single retry after a reply that is not valid JSON
+    retry_temperature: float = 0.0
+
     def __init__(self, model: str = "llama2", sglang_host: str = "http://localhost", sglang_port: int = 30000):
         self.model = model
         self.sglang_host = sglang_host
         self.sglang_port = sglang_port
         self.base_url = f"{sglang_host}:{sglang_port}"
 
-    def get_completion(self, prompt: str, response_format: dict, temperature: float = 1.0) -> str:
-        try:
+        # Pooled keep-alive session, shared with other controllers for this server
+        self.session = _get_sglang_session(self.base_url)
+
+        # Async session is bound to an event loop, so it is created on first aget_completion()
+        self._aio_session: Optional[aiohttp.ClientSession] = None
+        self._aio_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Task that closes _aio_session on its loop when cancelled (see _get_aio_session)
+        self._aio_closer: Optional[asyncio.Task] = None
+
+        # id(response_format) -> (response_format, serialized JSON schema)
+        self._schema_str_cache: Dict[int, Tuple[dict, str]] = {}
+
+    def _schema_str(self, response_format: dict) -> str:
+        """Serialized JSON schema for SGLang's constrained decoding, built once per response_format."""
+        key = id(response_format)
+        entry = self._schema_str_cache.get(key)
+        if entry is None or entry[0] is not response_format:
             json_schema = response_format.get("json_schema", {}).get("schema", {})
-            json_schema_str = json.dumps(json_schema)
-
-            payload = {
-                "text": prompt,
-                "sampling_params": {
-                    "temperature": temperature,
-                    "max_new_tokens": 1000,
-                    "json_schema": json_schema_str
-                }
+            entry = (response_format, json.dumps(json_schema))
+            self._schema_str_cache[key] = entry
+        return entry[1]
+
+    def _build_payload(self, prompt: str, response_format: dict, temperature: float) -> dict:
+        json_schema_str = self._schema_str(response_format)
+
+        return {
+            "text": prompt,
+            "sampling_params": {
+                "temperature": temperature,
+                "max_new_tokens": 1000,
+                "json_schema": json_schema_str
             }
+        }
 
-            response = requests.post(
-                f"{self.base_url}/generate",
+    def _get_aio_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._aio_session is None or self._aio_session.closed or self._aio_loop is not loop:
+            # Close the session being replaced instead of leaking its sockets
+            self._discard_aio_session()
+            session = aiohttp.ClientSession(
+                base_url=self.base_url,
                 headers={"Content-Type": "application/json"},
-                json=payload,
-                timeout=60
+                timeout=aiohttp.ClientTimeout(total=60),
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=self.max_concurrent, keepalive_timeout=30)
             )
+            self._aio_session = session
+            self._aio_loop = loop
+            # asyncio.run() cancels outstanding tasks before closing its loop, so this
+            # closes the session on its own loop even if aclose() is never called
+            self._aio_closer = loop.create_task(self._close_when_cancelled(session))
+        return self._aio_session
 
-            if response.status_code == 200:
-                result = response.json()
-                generated_text = result.get("text", "")
-                return generated_text
-            else:
-                print(f"SGLang server returned status {response.status_code}: {response.text}")
-                raise Exception(f"SGLang server error: {response.status_code}")
+    @staticmethod
+    async def _close_when_cancelled(session: aiohttp.ClientSession):
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            await session.close()
+
+    def _discard_aio_session(self):
+        """Schedule the current session's close on the loop it belongs to."""
+        closer = self._aio_closer
+        self._aio_session = None
+        self._aio_loop = None
+        self._aio_closer = None
+        if closer is not None and not closer.done() and not closer.get_loop().is_closed():
+            closer.get_loop().call_soon_threadsafe(closer.cancel)
+
+    async def aclose(self):
+        """Close the async HTTP session."""
+        session, loop = self._aio_session, self._aio_loop
+        self._discard_aio_session()
+        if session is not None and loop is asyncio.get_running_loop():
+            await session.close()
+
+    def _generate(self, prompt: str, response_format: dict, temperature: float) -> str:
+        payload = self._build_payload(prompt, response_format, temperature)
+
+        response = self.session.post(
+            f"{self.base_url}/generate",
+            json=payload,
+            timeout=60
+        )
+
+        if response.status_code == 200:
+            result = response.json()
+            generated_text = result.get("text", "")
+            return generated_text
+        else:
+            print(f"SGLang server returned status {response.status_code}: {response.text}")
+            raise Exception(f"SGLang server error: {response.status_code}")
+
+    async def _agenerate(self, prompt: str, response_format: dict, temperature: float) -> str:
+        payload = self._build_payload(prompt, response_format, temperature)
+        session = self._get_aio_session()
+
+        async with self._async_limit():
+            async with session.post("/generate", json=payload) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return result.get("text", "")
+                text = await response.text()
+                print(f"SGLang server returned status {response.status}: {text}")
+                raise Exception(f"SGLang server error: {response.status}")
+
+    @staticmethod
+    def _is_malformed(text: str, response_format: dict) -> bool:
+        """Whether a schema-constrained reply failed to parse as JSON."""
+        if "json_schema" not in response_format:
+            return False
+        try:
+            json.loads(text)
+            return False
+        except (TypeError, ValueError):
+            return True
+
+    def get_completion(self, prompt: str, response_format: dict, temperature: float = 1.0) -> str:
+        try:
+            text = self._generate(prompt, response_format, temperature)
+            if self._is_malformed(text, response_format) and temperature > self.retry_temperature:
+                print("SGLang returned malformed JSON, retrying at lower temperature")
+                text = self._generate(prompt, response_format, self.retry_temperature)
+            if self._is_malformed(text, response_format):
+                raise ValueError(f"SGLang returned malformed JSON: {text[:200]!r}")
+            return text
+
+        except Exception as e:
+            print(f"SGLang completion error: {e}")
+            return self._empty_json(response_format)
+
+    async def aget_completion(self, prompt: str, response_format: dict, temperature: float = 1.0) -> str:
+        try:
+            text = await self._agenerate(prompt, response_format, temperature)
+            if self._is_malformed(text, response_format) and temperature > self.retry_temperature:
+                print("SGLang returned malformed JSON, retrying at lower temperature")
+                text = await self._agenerate(prompt, response_format, self.retry_temperature)
+            if self._is_malformed(text, response_format):
+                raise ValueError(f"SGLang returned malformed JSON: {text[:200]!r}")
+            return text
 
         except Exception as e:
             print(f"SGLang completion error: {e}")
-            empty_response = self._generate_empty_response(response_format)
-            return json.dumps(empty_response)
+            return self._empty_json(response_format)
 
 class OpenRouterController(BaseLLMController):
     """LLM controller for OpenRouter API using litellm.
@@ -208,20 +594,232 @@ class OpenRouterController(BaseLLMController):
             return response.choices[0].message.content
         except Exception as e:
             # Silently fall back to empty response on error
-            empty_response = self._generate_empty_response(response_format)
-            return json.dumps(empty_response)
+            return self._empty_json(response_format)
+
+    async def aget_completion(self, prompt: str, response_format: dict, temperature: float = 1.0) -> str:
+        """Async variant of get_completion() using litellm.acompletion."""
+        try:
+            async with self._async_limit():
+                response = await acompletion(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": "You must respond with a JSON object."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format=response_format,
+                    temperature=temperature
+                )
+            return response.choices[0].message.content
+        except Exception as e:
+            # Silently fall back to empty response on error
+            return self._empty_json(response_format)
+
+class _Flight:
+    """A backend call in progress that other threads can wait on."""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+class LLMCache:
+    """Exact-match cache for deterministic LLM completions.
+
+    Responses are keyed by a SHA-256 hash of (model, prompt, response_format,
+    temperature). Only calls at or below ``max_temperature`` are cached, so
+    sampled (creative) completions still reach the backend every time.
+
+    Entries live in an in-memory LRU. When ``db_path`` is given, entries are
+    also persisted to a SQLite file so they survive restarts.
+
+    Args:
+        max_size: Maximum number of entries kept in the in-memory LRU
+        db_path: Optional SQLite file path for a persistent second tier
+        max_temperature: Highest temperature whose responses are cached
+    """
+
+    def __init__(self, max_size: int = 1024, db_path: Optional[str] = None, max_temperature: float = 0.0):
+        self.max_size = max_size
+        self.max_temperature = max_temperature
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._db = None
+        if db_path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, response TEXT NOT NULL)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, response_format: Optional[dict], temperature: float) -> str:
+        """Build the cache key for a completion request."""
+        payload = json.dumps({"m": model, "p": prompt, "s": response_format, "t": temperature}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def should_cache(self, temperature: float) -> bool:
+        """Return True if completions at this temperature are deterministic enough to cache."""
+        return temperature is not None and temperature <= self.max_temperature
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response, checking the LRU before the SQLite tier."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._put(key, row[0])
+                    self.hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, response: str):
+        """Store a response in the LRU (and SQLite tier, if enabled)."""
+        with self._lock:
+            self._put(key, response)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO llm_cache (key, response) VALUES (?, ?)", (key, response))
+                self._db.commit()
+
+    def _put(self, key: str, response: str):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        elif len(self._entries) >= self.max_size:
+            self._entries.popitem(last=False)
+        self._entries[key] = response
+
+    def clear(self):
+        """Drop all cached entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Cache hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+class SemanticLLMCache:
+    """Embedding-similarity cache for paraphrased LLM prompts.
+
+    Each cached prompt is embedded with the memory system's sentence
+    transformer. A lookup returns the stored response of the most similar
+    prompt when cosine similarity reaches ``threshold`` and the request used
+    the same ``response_format``. Entries are bucketed per schema and kept as
+    a normalized numpy matrix, so a lookup is a single matrix-vector product.
+
+    Args:
+        embedder: Callable mapping a list of texts to a list of embeddings
+            (e.g. a ChromaDB ``SentenceTransformerEmbeddingFunction``)
+        threshold: Minimum cosine similarity for a hit
+        max_temperature: Highest temperature whose responses are cached
+        max_size: Maximum entries per schema bucket (oldest evicted first)
+    """
+
+    def __init__(self,
+                 embedder: Callable[[List[str]], Any],
+                 threshold: float = 0.92,
+                 max_temperature: float = 0.2,
+                 max_size: int = 1000):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_temperature = max_temperature
+        self.max_size = max_size
+        self._buckets: Dict[str, Tuple[np.ndarray, List[str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def should_cache(self, temperature: float) -> bool:
+        """Return True if completions at this temperature may be served semantically."""
+        return temperature is not None and temperature <= self.max_temperature
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed text and L2-normalize it."""
+        vector = np.asarray(self.embedder([text])[0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def get(self, embedding: np.ndarray, response_format: Optional[dict]) -> Optional[str]:
+        """Return the response of the closest cached prompt above threshold, if any."""
+        schema_key = json.dumps(response_format, sort_keys=True)
+        with self._lock:
+            bucket = self._buckets.get(schema_key)
+            if bucket is not None:
+                matrix, responses = bucket
+                sims = matrix @ embedding
+                best = int(np.argmax(sims))
+                if sims[best] >= self.threshold:
+                    self.hits += 1
+                    return responses[best]
+            self.misses += 1
+            return None
+
+    def set(self, embedding: np.ndarray, response_format: Optional[dict], response: str):
+        """Add a prompt embedding and its response to the matching schema bucket."""
+        schema_key = json.dumps(response_format, sort_keys=True)
+        with self._lock:
+            matrix, responses = self._buckets.get(schema_key, (np.empty((0, embedding.shape[0]), dtype=np.float32), []))
+            matrix = np.vstack([matrix, embedding[np.newaxis, :]])
+            responses = responses + [response]
+            if len(responses) > self.max_size:
+                matrix, responses = matrix[-self.max_size:], responses[-self.max_size:]
+            self._buckets[schema_key] = (matrix, responses)
+
+    def clear(self):
+        """Drop all cached entries and reset statistics."""
+        with self._lock:
+            self._buckets.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Cache hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses, "size": sum(len(r) for _, r in self._buckets.values())}
 
 class LLMController:
     """LLM-based controller for memory metadata generation.
 
     Supports multiple backends: OpenAI, Ollama, SGLang, and OpenRouter.
+    Deterministic completions are served from an exact-match ``LLMCache``;
+    when an ``embedder`` is supplied, near-deterministic completions are also
+    served from a ``SemanticLLMCache`` for paraphrased prompts. The semantic
+    layer reuses a response across *different* inputs, so its default
+    ``semantic_threshold`` only matches near-verbatim repeats, and callers
+    whose response depends on more than the semantic key opt out per call
+    with ``use_semantic_cache=False``. When
+    ``rate_limit_rpm``/``rate_limit_tpm`` are set, backend calls are paced by a
+    ``TokenBucket``; rate-limit and transient server errors are retried with
+    jittered exponential backoff. Identical requests already in flight are
+    coalesced, so concurrent callers share a single backend call.
     """
+    max_retries: int = 6
+
     def __init__(self,
                  backend: Literal["openai", "ollama", "sglang", "openrouter"] = "openai",
                  model: str = "gpt-4",
                  api_key: Optional[str] = None,
                  sglang_host: str = "http://localhost",
-                 sglang_port: int = 30000):
+                 sglang_port: int = 30000,
+                 cache: Optional[LLMCache] = None,
+                 embedder: Optional[Callable[[List[str]], Any]] = None,
+                 semantic_threshold: float = 0.98,
+                 rate_limit_rpm: Optional[float] = None,
+                 rate_limit_tpm: Optional[float] = None):
         if backend == "openai":
             self.llm = OpenAIController(model, api_key)
         elif backend == "ollama":
@@ -232,6 +830,206 @@ class LLMController:
             self.llm = OpenRouterController(model, api_key)
         else:
             raise ValueError("Backend must be one of: 'openai', 'ollama', 'sglang', 'openrouter'")
+        self.cache = cache if cache is not None else LLMCache()
+        self.semantic_cache = (SemanticLLMCache(embedder, threshold=semantic_threshold)
+                               if embedder is not None else None)
+        self.rate_limiter = TokenBucket(rate_limit_rpm, rate_limit_tpm) if (rate_limit_rpm or rate_limit_tpm) else None
+        self.llm.rate_limiter = self.rate_limiter
+        # Singleflight: identical concurrent requests share one backend call
+        self._inflight: Dict[str, _Flight] = {}
+        self._inflight_lock = threading.Lock()
+        self._ainflight: Dict[str, asyncio.Task] = {}
+
+    def get_completion(self, prompt: str, response_format: dict = None, temperature: float = 1.0,
+                       semantic_key: Optional[str] = None,
+                       on_token: Optional[Callable[[str], None]] = None,
+                       use_semantic_cache: bool = True) -> str:
+        """Get a completion, consulting the exact and semantic caches first.
+
+        Args:
+            prompt: The prompt to send to the LLM.
+            response_format: JSON schema specifying the expected response format.
+            temperature: Sampling temperature.
+            semantic_key: Text embedded for the semantic cache. Defaults to the
+                prompt; callers with a long fixed template should pass only the
+                variable part so the template does not dominate similarity.
+            on_token: Optional callback receiving response text as it streams.
+                Backends without streaming support (and cache hits) deliver
+                the whole response in a single call.
+            use_semantic_cache: Set False when a similar prompt must not reuse
+                this response (e.g. it depends on context beyond the semantic
+                key); the exact-match cache is still used.
+
+        Returns:
+            JSON string containing the LLM response.
+        """
+        cached, entry = self._cache_lookup(prompt, response_format, temperature, semantic_key, use_semantic_cache)
+        if cached is not None:
+            if on_token is not None:
+                on_token(cached)
+            return cached
+
+        if on_token is not None:
+            # Streaming callers each get their own token stream
+            response = self._call_backend(prompt, response_format, temperature, on_token)
+        else:
+            response = self._call_coalesced(prompt, response_format, temperature)
+        self._cache_store(entry, response_format, response)
+        return response
+
+    async def aget_completion(self, prompt: str, response_format: dict = None, temperature: float = 1.0,
+                              semantic_key: Optional[str] = None,
+                              on_token: Optional[Callable[[str], None]] = None,
+                              use_semantic_cache: bool = True) -> str:
+        """Async variant of get_completion().
+
+        Lets concurrent callers keep their LLM requests in flight together
+        instead of blocking the event loop (or a worker thread) per call.
+        """
+        if use_semantic_cache and self.semantic_cache is not None and self.semantic_cache.should_cache(temperature):
+            # Embedding the prompt is CPU-bound; keep it off the event loop
+            cached, entry = await asyncio.to_thread(self._cache_lookup, prompt, response_format, temperature,
+                                                    semantic_key, use_semantic_cache)
+        else:
+            cached, entry = self._cache_lookup(prompt, response_format, temperature, semantic_key, use_semantic_cache)
+        if cached is not None:
+            if on_token is not None:
+                on_token(cached)
+            return cached
+
+        if on_token is not None:
+            response = await self._acall_backend(prompt, response_format, temperature, on_token)
+        else:
+            response = await self._acall_coalesced(prompt, response_format, temperature)
+        self._cache_store(entry, response_format, response)
+        return response
+
+    async def aclose(self):
+        """Close the backend's async connection pool; call before the event loop shuts down."""
+        await self.llm.aclose()
+
+    def _flight_key(self, prompt: str, response_format: Optional[dict], temperature: float) -> str:
+        return LLMCache.make_key(getattr(self.llm, "model", ""), prompt, response_format, temperature)
+
+    def _call_coalesced(self, prompt: str, response_format: Optional[dict], temperature: float) -> str:
+        """_call_backend(), joining an identical call already in flight on another thread."""
+        key = self._flight_key(prompt, response_format, temperature)
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._call_backend(prompt, response_format, temperature)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    async def _acall_coalesced(self, prompt: str, response_format: Optional[dict], temperature: float) -> str:
+        """_acall_backend(), awaiting an identical call already in flight on this loop."""
+        key = self._flight_key(prompt, response_format, temperature)
+        task = self._ainflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            # The shared call runs in its own task, owned by no single caller
+            task = asyncio.ensure_future(self._acall_backend(prompt, response_format, temperature))
+            self._ainflight[key] = task
+            task.add_done_callback(lambda t: self._aflight_done(key, t))
+        # shield: cancelling any caller, the first one included, must not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _aflight_done(self, key: str, task: asyncio.Task):
+        """Forget a finished async flight."""
+        if self._ainflight.get(key) is task:
+            del self._ainflight[key]
+        if not task.cancelled():
+            # Mark retrieved so a flight whose callers were all cancelled does not log a warning
+            task.exception()
+
+    def _call_backend(self, prompt: str, response_format: Optional[dict], temperature: float,
+                      on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Call the backend with rate limiting and retry on 429/5xx."""
+        for attempt in range(self.max_retries):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(TokenBucket.estimate_tokens(prompt))
+            try:
+                if on_token is None:
+                    return self.llm.get_completion(prompt, response_format, temperature)
+                if self.llm.supports_streaming:
+                    return self.llm.get_completion(prompt, response_format, temperature, on_token=on_token)
+                response = self.llm.get_completion(prompt, response_format, temperature)
+                on_token(response)
+                return response
+            except Exception as e:
+                if not _is_retryable(e) or attempt == self.max_retries - 1:
+                    raise
+                time.sleep(_backoff_delay(attempt))
+
+    async def _acall_backend(self, prompt: str, response_format: Optional[dict], temperature: float,
+                             on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Async variant of _call_backend()."""
+        for attempt in range(self.max_retries):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire(TokenBucket.estimate_tokens(prompt))
+            try:
+                if on_token is None:
+                    return await self.llm.aget_completion(prompt, response_format, temperature)
+                if self.llm.supports_streaming:
+                    return await self.llm.aget_completion(prompt, response_format, temperature, on_token=on_token)
+                response = await self.llm.aget_completion(prompt, response_format, temperature)
+                on_token(response)
+                return response
+            except Exception as e:
+                if not _is_retryable(e) or attempt == self.max_retries - 1:
+                    raise
+                await asyncio.sleep(_backoff_delay(attempt))
+
+    def _cache_lookup(self, prompt: str, response_format: Optional[dict], temperature: float,
+                      semantic_key: Optional[str],
+                      use_semantic_cache: bool = True) -> Tuple[Optional[str], Tuple[Optional[str], Optional[np.ndarray]]]:
+        """Check the exact and semantic caches.
+
+        Returns:
+            (cached_response_or_None, (exact_key, semantic_embedding)) where the
+            second element is passed back to _cache_store() on a miss.
+        """
+        key = None
+        embedding = None
+
+        if self.cache.should_cache(temperature):
+            key = LLMCache.make_key(self.llm.model, prompt, response_format, temperature)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached, (key, embedding)
+
+        if use_semantic_cache and self.semantic_cache is not None and self.semantic_cache.should_cache(temperature):
+            embedding = self.semantic_cache.embed(semantic_key or prompt)
+            cached = self.semantic_cache.get(embedding, response_format)
+            if cached is not None:
+                return cached, (key, embedding)
+
+        return None, (key, embedding)
 
-    def get_completion(self, prompt: str, response_format: dict = None, temperature: float = 1.0) -> str:
-        return self.llm.get_completion(prompt, response_format, temperature)
+    def _cache_store(self, entry: Tuple[Optional[str], Optional[np.ndarray]], response_format: Optional[dict], response: str):
+        """Store a fresh response in whichever caches were consulted."""
+        key, embedding = entry
+        if key is None and embedding is None:
+            return
+        # Backends swallow errors into an empty schema-shaped response; never cache those
+        if not response or response == self.llm._empty_json(response_format or {}):
+            return
+        if key is not None:
+            self.cache.set(key, response)
+        if embedding is not None:
+            self.semantic_cache.set(embedding, response_format, response)
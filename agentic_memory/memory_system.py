@@ -19,10 +19,116 @@ import pickle
 from pathlib import Path
 from litellm import completion
 import time
-from collections import OrderedDict
+import asyncio
+import threading
+from collections import Counter, OrderedDict
+from itertools import islice
 
 logger = logging.getLogger(__name__)
 
+# Content length kept in the summary view served by memory://all and memory://by-tag
+SUMMARY_CONTENT_LENGTH = 200
+
+# Metadata extraction and evolution decisions should be reproducible, so they run
+# greedy; this is also what lets LLMController serve repeats from its response cache
+_LLM_TEMPERATURE = 0.0
+
+# Metadata fields extracted for a single note
+_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "keywords": {
+            "type": "array",
+            "items": {
+                "type": "string"
+            }
+        },
+        "context": {
+            "type": "string",
+        },
+        "tags": {
+            "type": "array",
+            "items": {
+                "type": "string"
+            }
+        }
+    },
+    "required": ["keywords", "context", "tags"],
+    "additionalProperties": False
+}
+
+# Response schema for single-note metadata extraction (analyze_content)
+_ANALYSIS_RESPONSE_FORMAT = {"type": "json_schema", "json_schema": {
+    "name": "response",
+    "schema": _ANALYSIS_SCHEMA
+}}
+
+# Response schema for batched metadata extraction (analyze_contents)
+_BATCH_ANALYSIS_RESPONSE_FORMAT = {"type": "json_schema", "json_schema": {
+    "name": "response",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "notes": {
+                "type": "array",
+                "items": _ANALYSIS_SCHEMA
+            }
+        },
+        "required": ["notes"],
+        "additionalProperties": False
+    }
+}}
+
+# Response schema for memory evolution decisions (process_memory)
+_EVOLUTION_RESPONSE_FORMAT = {"type": "json_schema", "json_schema": {
+    "name": "response",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "should_evolve": {
+                "type": "boolean"
+            },
+            "actions": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                }
+            },
+            "suggested_connections": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                }
+            },
+            "new_context_neighborhood": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                }
+            },
+            "tags_to_update": {
+                "type": "array",
+                "items": {
+                    "type": "string"
+                }
+            },
+            "new_tags_neighborhood": {
+                "type": "array",
+                "items": {
+                    "type": "array",
+                    "items": {
+                        "type": "string"
+                    }
+                }
+            }
+        },
+        "required": ["should_evolve", "actions", "suggested_connections", 
+                  "tags_to_update", "new_context_neighborhood", "new_tags_neighborhood"],
+        "additionalProperties": False
+    },
+    "strict": True
+}}
+
 class MemoryNote:
     """A memory note that represents a single unit of information in the memory system.
     
@@ -189,7 +295,10 @@ class AgenticMemorySystem:
                  sglang_port: int = 30000,
                  storage_path: str = "./chroma_db",
                  cache_size: int = 1000,
-                 enable_cache: bool = True):
+                 enable_cache: bool = True,
+                 llm_rate_limit_rpm: Optional[float] = None,
+                 llm_rate_limit_tpm: Optional[float] = None,
+                 embedding_backend: str = "torch"):
         """Initialize the memory system.
 
         Args:
@@ -203,6 +312,9 @@ class AgenticMemorySystem:
             storage_path: Directory path for persistent ChromaDB storage (default: ./chroma_db)
             cache_size: Maximum number of memories to keep in LRU cache (default: 1000)
             enable_cache: Whether to enable memory caching (default: True)
+            llm_rate_limit_rpm: Client-side LLM requests-per-minute limit (default: None, unlimited)
+            llm_rate_limit_tpm: Client-side LLM tokens-per-minute limit (default: None, unlimited)
+            embedding_backend: Embedding runtime, "torch" or "onnx" (all-MiniLM-L6-v2 only; default: torch)
         """
         # Initialize thread-safe LRU cache instead of self.memories dict
         self.cache = ThreadSafeMemoryCache(max_size=cache_size)
@@ -215,14 +327,28 @@ class AgenticMemorySystem:
         self.retriever = ChromaRetriever(
             collection_name="memories",
             model_name=self.model_name,
-            persist_directory=self.storage_path
+            persist_directory=self.storage_path,
+            embedding_backend=embedding_backend
         )
 
-        # Initialize LLM controller
-        self.llm_controller = LLMController(llm_backend, llm_model, api_key, sglang_host, sglang_port)
+        # Initialize LLM controller (shares the retriever's embedder for semantic caching)
+        self.llm_controller = LLMController(llm_backend, llm_model, api_key, sglang_host, sglang_port,
+                                            embedder=self.retriever.embedding_function,
+                                            rate_limit_rpm=llm_rate_limit_rpm,
+                                            rate_limit_tpm=llm_rate_limit_tpm)
         self.evo_cnt = 0
         self.evo_threshold = evo_threshold
 
+        # Truncated summary view of every memory plus a tag -> ids inverted index.
+        # Built lazily from ChromaDB on first use, then kept current by add/update/delete.
+        self._summaries: Optional[Dict[str, Dict[str, Any]]] = None
+        # tag -> {memory_id: None}; dicts keep ids in summary-view (insertion) order
+        self._tag_index: Dict[str, Dict[str, None]] = {}
+        self._tag_counter: Counter = Counter()
+        self._summary_lock = threading.Lock()
+        # Bumped on every add/update/delete so callers can invalidate derived caches
+        self.write_generation = 0
+
         # Log initialization info
         existing_count = self.retriever.count()
         logger.info(f"AgenticMemorySystem initialized with {existing_count} existing memories in ChromaDB")
@@ -306,24 +432,9 @@ class AgenticMemorySystem:
             "tags": note.tags
         }
 
-    def analyze_content(self, content: str) -> Dict:            
-        """Analyze content using LLM to extract semantic metadata.
-        
-        Uses a language model to understand the content and extract:
-        - Keywords: Important terms and concepts
-        - Context: Overall domain or theme
-        - Tags: Classification categories
-        
-        Args:
-            content (str): The text content to analyze
-            
-        Returns:
-            Dict: Contains extracted metadata with keys:
-                - keywords: List[str]
-                - context: str
-                - tags: List[str]
-        """
-        prompt = """Generate a structured analysis of the following content by:
+    def _analysis_prompt(self, content: str) -> str:
+        """Build the metadata-extraction prompt for a single content."""
+        return """Generate a structured analysis of the following content by:
             1. Identifying the most salient keywords (focus on nouns, verbs, and key concepts)
             2. Extracting core themes and contextual elements
             3. Creating relevant categorical tags
@@ -351,93 +462,225 @@ class AgenticMemorySystem:
 
             Content for analysis:
             """ + content
+
+    def analyze_content(self, content: str) -> Dict:            
+        """Analyze content using LLM to extract semantic metadata.
+        
+        Uses a language model to understand the content and extract:
+        - Keywords: Important terms and concepts
+        - Context: Overall domain or theme
+        - Tags: Classification categories
+        
+        Args:
+            content (str): The text content to analyze
+            
+        Returns:
+            Dict: Contains extracted metadata with keys:
+                - keywords: List[str]
+                - context: str
+                - tags: List[str]
+        """
         try:
-            response = self.llm_controller.llm.get_completion(prompt, response_format={"type": "json_schema", "json_schema": {
-                        "name": "response",
-                        "schema": {
-                            "type": "object",
-                            "properties": {
-                                "keywords": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "string"
-                                    }
-                                },
-                                "context": {
-                                    "type": "string",
-                                },
-                                "tags": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "string"
-                                    }
-                                }
-                            }
-                        }
-                    }})
+            response = self.llm_controller.get_completion(self._analysis_prompt(content),
+                                                          response_format=_ANALYSIS_RESPONSE_FORMAT,
+                                                          temperature=_LLM_TEMPERATURE,
+                                                          semantic_key=content)
             return json.loads(response)
         except Exception as e:
             print(f"Error analyzing content: {e}")
             return {"keywords": [], "context": "General", "tags": []}
 
-    def add_note(self, content: str, time: str = None, **kwargs) -> str:
-        """Add a new memory note"""
-        # Create MemoryNote without llm_controller
+    async def analyze_content_async(self, content: str) -> Dict:
+        """Async variant of analyze_content() that awaits the LLM call."""
+        try:
+            response = await self.llm_controller.aget_completion(self._analysis_prompt(content),
+                                                                 response_format=_ANALYSIS_RESPONSE_FORMAT,
+                                                                 temperature=_LLM_TEMPERATURE,
+                                                                 semantic_key=content)
+            return json.loads(response)
+        except Exception as e:
+            print(f"Error analyzing content: {e}")
+            return {"keywords": [], "context": "General", "tags": []}
+
+    def analyze_contents(self, contents: List[str]) -> List[Dict]:
+        """Analyze several contents with a single LLM call.
+
+        Batches metadata extraction for bursts of notes so N notes cost one
+        round-trip instead of N. Falls back to per-item analyze_content() when
+        only one content is given or the batched response is unusable.
+
+        Args:
+            contents: Texts to analyze
+
+        Returns:
+            List of metadata dicts (keywords, context, tags), one per content,
+            in input order
+        """
+        if len(contents) <= 1:
+            return [self.analyze_content(content) for content in contents]
+
+        numbered = "\n".join(f"{i}. {content}" for i, content in enumerate(contents, 1))
+        prompt = """Generate a structured analysis for EACH of the following numbered notes by:
+            1. Identifying the most salient keywords (focus on nouns, verbs, and key concepts)
+            2. Extracting core themes and contextual elements
+            3. Creating relevant categorical tags
+
+            Return a JSON object with a "notes" array containing exactly one entry per note,
+            in the same order as the input. Each entry has:
+                "keywords": at least three specific, distinct keywords, most important first,
+                "context": one sentence summarizing the main topic, key points and purpose,
+                "tags": at least three broad categories (domain, format, type)
+
+            Notes for analysis:
+            """ + numbered
+        try:
+            response = self.llm_controller.get_completion(prompt, response_format=_BATCH_ANALYSIS_RESPONSE_FORMAT,
+                                                          temperature=_LLM_TEMPERATURE,
+                                                          use_semantic_cache=False)
+            analyses = json.loads(response).get("notes", [])
+            if len(analyses) == len(contents):
+                return analyses
+            logger.warning(f"Batched analysis returned {len(analyses)} entries for {len(contents)} notes, falling back")
+        except Exception as e:
+            logger.warning(f"Batched analysis failed, falling back to per-note analysis: {e}")
+        return [self.analyze_content(content) for content in contents]
+
+    def _new_note(self, content: str, time: Optional[str], kwargs: Dict) -> MemoryNote:
+        """Create the MemoryNote for add_note()/add_note_async()."""
         if time is not None:
             kwargs['timestamp'] = time
-        note = MemoryNote(content=content, **kwargs)
-        
-        # 🔧 LLM Analysis Enhancement: Auto-generate attributes using LLM if they are empty or default values
-        needs_analysis = (
+        return MemoryNote(content=content, **kwargs)
+
+    def _needs_analysis(self, note: MemoryNote) -> bool:
+        """Whether any LLM-generated attribute is empty or still at its default."""
+        return (
             not note.keywords or  # keywords is empty list
             note.context == "General" or  # context is default value
             not note.tags  # tags is empty list
         )
+
+    def _apply_analysis(self, note: MemoryNote, analysis: Dict):
+        """Fill only the attributes that were not provided or have default values."""
+        if not note.keywords:
+            note.keywords = analysis.get("keywords", [])
+        if note.context == "General":
+            note.context = analysis.get("context", "General") 
+        if not note.tags:
+            note.tags = analysis.get("tags", [])
+
+    def _store_note(self, note: MemoryNote, evo_label: bool) -> str:
+        """Cache and persist a processed note."""
+        return self._store_notes([(note, evo_label)])[0]
+
+    def _store_notes(self, processed: List[Tuple[MemoryNote, bool]]) -> List[str]:
+        """Cache and persist processed notes with a single ChromaDB add."""
+        notes = [note for note, _ in processed]
+
+        # Cache the new memories (write-through caching)
+        if self.cache_enabled:
+            for note in notes:
+                self.cache.put(note.id, note)
+
+        # Add to ChromaDB with complete metadata (persistent storage)
+        self.retriever.add_documents(
+            [note.content for note in notes],
+            [self._memory_note_to_metadata(note) for note in notes],
+            [note.id for note in notes]
+        )
+        for note in notes:
+            self._refresh_summary(note)
+
+        # Track evolution count (could be used for metrics/logging)
+        self.evo_cnt += sum(1 for _, evo_label in processed if evo_label)
+        # Note: consolidate_memories() removed - all changes now sync immediately
+
+        return [note.id for note in notes]
+
+    def add_note(self, content: str, time: str = None, **kwargs) -> str:
+        """Add a new memory note"""
+        # Create MemoryNote without llm_controller
+        note = self._new_note(content, time, kwargs)
         
-        if needs_analysis:
-            # try:
-            analysis = self.analyze_content(content)
-            
-            # Only update attributes that are not provided or have default values
-            if not note.keywords:
-                note.keywords = analysis.get("keywords", [])
-            if note.context == "General":
-                note.context = analysis.get("context", "General") 
-            if not note.tags:
-                note.tags = analysis.get("tags", [])
-                    
-            # except Exception as e:
-            #     print(f"Warning: LLM analysis failed, using default values: {e}")
+        # 🔧 LLM Analysis Enhancement: Auto-generate attributes using LLM if they are empty or default values
+        if self._needs_analysis(note):
+            self._apply_analysis(note, self.analyze_content(content))
         
         # Process memory evolution
         evo_label, note = self.process_memory(note)
 
-        # Cache the new memory (write-through caching)
-        if self.cache_enabled:
-            self.cache.put(note.id, note)
+        return self._store_note(note, evo_label)
 
-        # Add to ChromaDB with complete metadata (persistent storage)
-        metadata = {
-            "id": note.id,
-            "content": note.content,
-            "keywords": note.keywords,
-            "links": note.links,
-            "retrieval_count": note.retrieval_count,
-            "timestamp": note.timestamp,
-            "last_accessed": note.last_accessed,
-            "context": note.context,
-            "evolution_history": note.evolution_history,
-            "category": note.category,
-            "tags": note.tags
-        }
-        self.retriever.add_document(note.content, metadata, note.id)
+    async def add_note_async(self, content: str, time: str = None, **kwargs) -> str:
+        """Async variant of add_note().
 
-        # Track evolution count (could be used for metrics/logging)
-        if evo_label == True:
-            self.evo_cnt += 1
-            # Note: consolidate_memories() removed - all changes now sync immediately
+        LLM calls are awaited on the controller's async client so concurrent
+        additions keep their requests in flight together; ChromaDB work runs
+        in a worker thread so it never blocks the event loop.
+        """
+        note = self._new_note(content, time, kwargs)
+
+        if self._needs_analysis(note):
+            self._apply_analysis(note, await self.analyze_content_async(content))
+
+        evo_label, note = await self.process_memory_async(note)
+
+        return await asyncio.to_thread(self._store_note, note, evo_label)
+    
+    def _new_notes(self, notes: List[Dict]) -> List[MemoryNote]:
+        """Create MemoryNotes for add_notes()/add_notes_async().
+
+        Each entry holds ``content`` plus the optional add_note() arguments
+        (``time``, ``keywords``, ``context``, ``tags``, ...).
+        """
+        created = []
+        for entry in notes:
+            kwargs = dict(entry)
+            content = kwargs.pop('content')
+            time = kwargs.pop('time', None)
+            created.append(self._new_note(content, time, kwargs))
+        return created
+
+    def _analyze_notes(self, notes: List[MemoryNote]):
+        """Fill missing LLM-generated attributes of several notes in one batched call."""
+        pending = [note for note in notes if self._needs_analysis(note)]
+        if pending:
+            analyses = self.analyze_contents([note.content for note in pending])
+            for note, analysis in zip(pending, analyses):
+                self._apply_analysis(note, analysis)
+
+    def add_notes(self, notes: List[Dict]) -> List[str]:
+        """Add several memory notes at once.
+
+        Metadata for all notes is generated in one batched LLM call and the
+        notes are embedded and written with a single ChromaDB add. Evolution
+        runs per note against the existing store, so notes in the same batch
+        are not linked to each other.
+
+        Args:
+            notes: Dicts with ``content`` and optional add_note() arguments
+
+        Returns:
+            List of memory IDs, in input order
+        """
+        created = self._new_notes(notes)
+        self._analyze_notes(created)
+        return self._store_notes([self.process_memory(note) for note in created])
+
+    async def add_notes_async(self, notes: List[Dict]) -> List[str]:
+        """Async variant of add_notes()."""
+        created = self._new_notes(notes)
+        await asyncio.to_thread(self._analyze_notes, created)
 
-        return note.id
+        # Evolution rewrites neighbors, so notes are evolved one at a time
+        processed = []
+        for note in created:
+            processed.append(await self.process_memory_async(note))
+
+        return await asyncio.to_thread(self._store_notes, processed)
+
+    async def aclose(self):
+        """Close async LLM connection pools; call before the event loop shuts down."""
+        await self.llm_controller.aclose()
     
     def find_related_memories(self, query: str, k: int = 5) -> Tuple[str, List[str]]:
         """Find related memories using ChromaDB retrieval
@@ -522,6 +765,7 @@ class AgenticMemorySystem:
                 # Update last_accessed timestamp
                 cached.last_accessed = datetime.now().strftime("%Y%m%d%H%M")
                 cached.retrieval_count += 1
+                self._touch_summaries([cached])
                 return cached
 
         # Cache miss - lazy load from ChromaDB
@@ -536,6 +780,7 @@ class AgenticMemorySystem:
             if self.cache_enabled:
                 self.cache.put(memory_id, note)
 
+            self._touch_summaries([note])
             return note
 
         return None
@@ -583,6 +828,7 @@ class AgenticMemorySystem:
                 else:
                     results[memory_id] = None
 
+        self._touch_summaries([note for note in results.values() if note is not None])
         return results
 
     def update(self, memory_id: str, **kwargs) -> bool:
@@ -614,6 +860,7 @@ class AgenticMemorySystem:
         # Sync to ChromaDB immediately (write-through)
         metadata = self._memory_note_to_metadata(note)
         self.retriever.update_document(memory_id, metadata, note.content)
+        self._refresh_summary(note)
 
         # Update cache with new version
         if self.cache_enabled:
@@ -640,11 +887,170 @@ class AgenticMemorySystem:
             if self.cache_enabled:
                 self.cache.remove(memory_id)
 
+            with self._summary_lock:
+                self.write_generation += 1
+                if self._summaries is not None:
+                    self._unindex_summary(memory_id)
+
             return True
         except Exception as e:
             logger.error(f"Error deleting memory {memory_id}: {e}")
             return False
-    
+
+    def reset_cache(self):
+        """Drop all in-process caches so subsequent reads come from ChromaDB.
+
+        Clears the LRU note cache and the summary view, and bumps
+        write_generation so derived caches are invalidated too.
+        """
+        self.cache.clear()
+        with self._summary_lock:
+            self.write_generation += 1
+            self._summaries = None
+            self._tag_index = {}
+            self._tag_counter = Counter()
+
+    def _summarize(self, note: MemoryNote) -> Dict[str, Any]:
+        """Build the truncated summary entry for a note."""
+        content = note.content
+        if len(content) > SUMMARY_CONTENT_LENGTH:
+            content = content[:SUMMARY_CONTENT_LENGTH] + "..."
+
+        return {
+            "id": note.id,
+            "content": content,
+            "keywords": note.keywords,
+            "tags": list(note.tags),  # copied so index removal sees the indexed tags
+            "context": note.context,
+            "timestamp": note.timestamp,
+            "retrieval_count": note.retrieval_count
+        }
+
+    def _index_summary(self, note: MemoryNote):
+        """Add a note to the summary view and tag index (caller holds the lock)."""
+        self._summaries[note.id] = self._summarize(note)
+        for tag in note.tags:
+            self._tag_index.setdefault(tag, {})[note.id] = None
+        self._tag_counter.update(note.tags)
+
+    def _unindex_summary(self, memory_id: str):
+        """Remove a note from the summary view and tag index (caller holds the lock)."""
+        summary = self._summaries.pop(memory_id, None)
+        if summary is None:
+            return
+        for tag in summary["tags"]:
+            ids = self._tag_index.get(tag)
+            if ids is not None:
+                ids.pop(memory_id, None)
+                if not ids:
+                    del self._tag_index[tag]
+        self._tag_counter.subtract(summary["tags"])
+        for tag in summary["tags"]:
+            if self._tag_counter[tag] <= 0:
+                del self._tag_counter[tag]
+
+    def _refresh_summary(self, note: MemoryNote):
+        """Re-index a note after it was written to ChromaDB."""
+        with self._summary_lock:
+            self.write_generation += 1
+            # Not built yet - the first build will read this note from ChromaDB
+            if self._summaries is None:
+                return
+            self._unindex_summary(note.id)
+            self._index_summary(note)
+
+    def _touch_summaries(self, notes: List[MemoryNote]):
+        """Carry read()'s retrieval_count bump into the summary view.
+
+        Access bookkeeping is not a store write, so write_generation is left
+        alone and cached search results stay valid.
+        """
+        with self._summary_lock:
+            if self._summaries is None:
+                return
+            for note in notes:
+                summary = self._summaries.get(note.id)
+                if summary is not None and summary["retrieval_count"] != note.retrieval_count:
+                    # Replace rather than mutate: callers may hold the previous dict
+                    self._summaries[note.id] = dict(summary, retrieval_count=note.retrieval_count)
+
+    def _ensure_summaries(self):
+        """Build the summary view from ChromaDB on first use."""
+        with self._summary_lock:
+            if self._summaries is not None:
+                return
+
+            self._summaries = {}
+            self._tag_index = {}
+            self._tag_counter = Counter()
+            all_ids = self.retriever.get_all_ids()
+            if all_ids:
+                metadata_map = self.retriever.get_by_ids(all_ids)
+                for memory_id in all_ids:
+                    metadata = metadata_map.get(memory_id)
+                    if metadata:
+                        self._index_summary(self._metadata_to_memory_note(metadata))
+
+            logger.info(f"Built memory summary view with {len(self._summaries)} entries")
+
+    def get_memory_summaries(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get truncated summaries of memories, in insertion order.
+
+        Served from an in-memory view maintained by add/update/delete, so
+        listing does not re-read and re-truncate every memory per request.
+
+        Args:
+            offset: Number of summaries to skip (default: 0)
+            limit: Maximum number of summaries to return (default: all)
+
+        Returns:
+            List of summary dicts (id, truncated content, keywords, tags,
+            context, timestamp, retrieval_count)
+        """
+        self._ensure_summaries()
+        stop = None if limit is None else offset + limit
+        with self._summary_lock:
+            return list(islice(self._summaries.values(), offset, stop))
+
+    def count_memory_summaries(self) -> int:
+        """Number of memories in the summary view."""
+        self._ensure_summaries()
+        with self._summary_lock:
+            return len(self._summaries)
+
+    def get_memory_summaries_by_tag(self, tag: str) -> List[Dict[str, Any]]:
+        """Get truncated summaries of memories carrying a tag.
+
+        Uses the tag inverted index, so the cost scales with the number of
+        matching memories rather than the total store size.
+
+        Args:
+            tag: Tag to filter by
+
+        Returns:
+            List of summary dicts for matching memories, in the same order
+            as get_memory_summaries()
+        """
+        self._ensure_summaries()
+        with self._summary_lock:
+            return [self._summaries[memory_id] for memory_id in self._tag_index.get(tag, ())]
+
+    def get_tag_counts(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Get tag usage counts, most frequent first.
+
+        Counts are maintained incrementally by add/update/delete, so this
+        does not walk the memory store.
+
+        Args:
+            n: Only return the n most frequent tags (default: all)
+
+        Returns:
+            List of (tag, count) pairs in descending order of count
+        """
+        self._ensure_summaries()
+        with self._summary_lock:
+            return self._tag_counter.most_common(n)
+
     def _search_raw(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
         """Internal search method that returns raw results from ChromaDB.
         
@@ -662,10 +1068,17 @@ class AgenticMemorySystem:
         return [{'id': doc_id, 'score': score} 
                 for doc_id, score in zip(results['ids'][0], results['distances'][0])]
                 
-    def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
-        """Search for memories using ChromaDB vector search with cache-aware loading."""
+    def search(self, query: str, k: int = 5, query_embedding: Optional[List[float]] = None,
+               raw_results: Optional[Dict] = None) -> List[Dict[str, Any]]:
+        """Search for memories using ChromaDB vector search with cache-aware loading.
+
+        raw_results, when given, is a retriever.search() result for this query
+        and is used instead of querying ChromaDB again.
+        """
         # Get results from ChromaDB
-        search_results = self.retriever.search(query, k)
+        search_results = raw_results
+        if search_results is None:
+            search_results = self.retriever.search(query, k, query_embedding=query_embedding)
         memories = []
 
         # Process ChromaDB results - load via cache-aware read()
@@ -743,19 +1156,27 @@ class AgenticMemorySystem:
 
         return memories[:k]
 
-    def search_agentic(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
-        """Search for memories using ChromaDB retrieval with linked neighbors."""
+    def search_agentic(self, query: str, k: int = 5, query_embedding: Optional[List[float]] = None,
+                       raw_results: Optional[Dict] = None) -> List[Dict[str, Any]]:
+        """Search for memories using ChromaDB retrieval with linked neighbors.
+
+        raw_results, when given, is a retriever.search() result for this query
+        and is used instead of querying ChromaDB again.
+        """
         # No need to check self.memories - ChromaDB is source of truth
-        if self.retriever.count() == 0:
+        if raw_results is None and self.retriever.count() == 0:
             return []
             
         try:
             # Get results from ChromaDB
-            results = self.retriever.search(query, k)
+            results = raw_results
+            if results is None:
+                results = self.retriever.search(query, k, query_embedding=query_embedding)
             
             # Process results
             memories = []
             seen_ids = set()
+            hit_links = []
             
             # Check if we have valid results
             if ('ids' not in results or not results['ids'] or 
@@ -787,37 +1208,45 @@ class AgenticMemorySystem:
                         
                     memories.append(memory_dict)
                     seen_ids.add(doc_id)
+                    hit_links.append((doc_id, metadata.get('links') or []))
             
-            # Add linked memories (neighbors)
-            neighbor_count = 0
-            for memory in list(memories):  # Use a copy to avoid modification during iteration
-                if neighbor_count >= k:
-                    break
-                    
-                # Get links from metadata
-                links = memory.get('links', [])
-                if not links and 'id' in memory:
-                    # Try to get links from memory object (cache-aware)
-                    mem_obj = self.read(memory['id'])
-                    if mem_obj:
-                        links = mem_obj.links
+            # Read the hits so their retrieval_count/last_accessed advance as with read();
+            # the notes also supply links when the query metadata did not carry them
+            hit_notes = self.read_multiple([memory_id for memory_id, _ in hit_links])
+
+            # Collect linked memory IDs (neighbors) across all hits, in rank order
+            link_ids = []
+            for memory_id, links in hit_links:
+                if not isinstance(links, list):
+                    mem_obj = hit_notes.get(memory_id)
+                    links = mem_obj.links if mem_obj else []
 
                 for link_id in links:
-                    if link_id not in seen_ids and neighbor_count < k:
-                        neighbor = self.read(link_id)  # Cache-aware lazy loading
-                        if neighbor:
-                            memories.append({
-                                'id': link_id,
-                                'context': neighbor.context,
-                                'keywords': neighbor.keywords,
-                                'tags': neighbor.tags,
-                                'timestamp': neighbor.timestamp,
-                                'category': neighbor.category,
-                                'is_neighbor': True
-                            })
-                            seen_ids.add(link_id)
-                            neighbor_count += 1
-            
+                    if link_id not in seen_ids:
+                        link_ids.append(link_id)
+                        seen_ids.add(link_id)
+
+            # Only k - len(hits) neighbors fit in the result, so read just that many in one
+            # batch and top up from later links only when some are missing; notes that
+            # would be cut off are never read and keep their access counters
+            position = 0
+            while len(memories) < k and position < len(link_ids):
+                batch = link_ids[position:position + k - len(memories)]
+                position += len(batch)
+                neighbors = self.read_multiple(batch)
+                for link_id in batch:
+                    neighbor = neighbors.get(link_id)
+                    if neighbor:
+                        memories.append({
+                            'id': link_id,
+                            'context': neighbor.context,
+                            'keywords': neighbor.keywords,
+                            'tags': neighbor.tags,
+                            'timestamp': neighbor.timestamp,
+                            'category': neighbor.category,
+                            'is_neighbor': True
+                        })
+
             return memories[:k]
         except Exception as e:
             logger.error(f"Error in search_agentic: {str(e)}")
@@ -892,138 +1321,146 @@ class AgenticMemorySystem:
             logger.error(f"Error in search_by_time: {str(e)}")
             return []
 
-    def process_memory(self, note: MemoryNote) -> Tuple[bool, MemoryNote]:
-        """Process a memory note and determine if it should evolve.
+    def _prepare_evolution(self, note: MemoryNote) -> Optional[Tuple[str, List[str]]]:
+        """Find a note's nearest neighbors and build the evolution prompt.
 
         Args:
             note: The memory note to process
 
         Returns:
-            Tuple[bool, MemoryNote]: (should_evolve, processed_note)
+            (prompt, neighbor_memory_ids), or None if there is nothing to evolve against
         """
         # For first memory, just return the note without evolution
         if self.retriever.count() == 0:
-            return False, note
+            return None
+
+        # Get nearest neighbors - now returns actual memory IDs
+        neighbors_text, memory_ids = self.find_related_memories(note.content, k=5)
+        if not neighbors_text or not memory_ids:
+            return None
+
+        # Format neighbors for LLM - in this case, neighbors_text is already formatted
+
+        # Query LLM for evolution decision
+        prompt = self._evolution_system_prompt.format(
+            content=note.content,
+            context=note.context,
+            keywords=note.keywords,
+            nearest_neighbors_memories=neighbors_text,
+            neighbor_number=len(memory_ids)
+        )
+        return prompt, memory_ids
 
-        try:
-            # Get nearest neighbors - now returns actual memory IDs
-            neighbors_text, memory_ids = self.find_related_memories(note.content, k=5)
-            if not neighbors_text or not memory_ids:
-                return False, note
+    def _apply_evolution(self, note: MemoryNote, response: str, memory_ids: List[str]) -> bool:
+        """Apply the LLM's evolution decision to the note and its neighbors.
 
-            # Format neighbors for LLM - in this case, neighbors_text is already formatted
+        Args:
+            note: The memory note being added
+            response: JSON evolution decision returned by the LLM
+            memory_ids: IDs of the neighbors presented to the LLM, in prompt order
 
-            # Query LLM for evolution decision
-            prompt = self._evolution_system_prompt.format(
-                content=note.content,
-                context=note.context,
-                keywords=note.keywords,
-                nearest_neighbors_memories=neighbors_text,
-                neighbor_number=len(memory_ids)
-            )
+        Returns:
+            bool: Whether the LLM decided the memory should evolve
+        """
+        response_json = json.loads(response)
+        should_evolve = response_json["should_evolve"]
+        
+        if should_evolve:
+            actions = response_json["actions"]
+            for action in actions:
+                if action == "strengthen":
+                    suggest_connections = response_json["suggested_connections"]
+                    new_tags = response_json["tags_to_update"]
+                    note.links.extend(suggest_connections)
+                    note.tags = new_tags
+                elif action == "update_neighbor":
+                    new_context_neighborhood = response_json["new_context_neighborhood"]
+                    new_tags_neighborhood = response_json["new_tags_neighborhood"]
+
+                    # Update each neighbor memory using its actual ID
+                    for i in range(min(len(memory_ids), len(new_tags_neighborhood))):
+                        memory_id = memory_ids[i]
+
+                        # Load neighbor from ChromaDB/cache (cache-aware)
+                        neighbor_memory = self.read(memory_id)
+                        if not neighbor_memory:
+                            logger.warning(f"Neighbor memory {memory_id} not found during evolution")
+                            continue
+
+                        # Prepare update kwargs
+                        update_kwargs = {}
+
+                        # Update tags
+                        if i < len(new_tags_neighborhood):
+                            update_kwargs['tags'] = new_tags_neighborhood[i]
+
+                        # Update context
+                        if i < len(new_context_neighborhood):
+                            update_kwargs['context'] = new_context_neighborhood[i]
+
+                        # CRITICAL: Sync to ChromaDB immediately (write-through)
+                        if update_kwargs:
+                            success = self.update(memory_id, **update_kwargs)
+                            if not success:
+                                logger.error(f"Failed to update neighbor {memory_id} during evolution")
+
+        return should_evolve
+
+    def process_memory(self, note: MemoryNote) -> Tuple[bool, MemoryNote]:
+        """Process a memory note and determine if it should evolve.
+
+        Args:
+            note: The memory note to process
+
+        Returns:
+            Tuple[bool, MemoryNote]: (should_evolve, processed_note)
+        """
+        try:
+            prepared = self._prepare_evolution(note)
+            if prepared is None:
+                return False, note
+            prompt, memory_ids = prepared
             
             try:
-                response = self.llm_controller.llm.get_completion(
-                    prompt,
-                    response_format={"type": "json_schema", "json_schema": {
-                        "name": "response",
-                        "schema": {
-                            "type": "object",
-                            "properties": {
-                                "should_evolve": {
-                                    "type": "boolean"
-                                },
-                                "actions": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "string"
-                                    }
-                                },
-                                "suggested_connections": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "string"
-                                    }
-                                },
-                                "new_context_neighborhood": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "string"
-                                    }
-                                },
-                                "tags_to_update": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "string"
-                                    }
-                                },
-                                "new_tags_neighborhood": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "array",
-                                        "items": {
-                                            "type": "string"
-                                        }
-                                    }
-                                }
-                            },
-                            "required": ["should_evolve", "actions", "suggested_connections", 
-                                      "tags_to_update", "new_context_neighborhood", "new_tags_neighborhood"],
-                            "additionalProperties": False
-                        },
-                        "strict": True
-                    }}
-                )
+                # Evolution depends on the neighbors, so a similar note must not reuse the decision
+                response = self.llm_controller.get_completion(prompt, response_format=_EVOLUTION_RESPONSE_FORMAT,
+                                                              temperature=_LLM_TEMPERATURE,
+                                                              use_semantic_cache=False)
+                return self._apply_evolution(note, response, memory_ids), note
                 
-                response_json = json.loads(response)
-                should_evolve = response_json["should_evolve"]
+            except (json.JSONDecodeError, KeyError, Exception) as e:
+                logger.error(f"Error in memory evolution: {str(e)}")
+                return False, note
                 
-                if should_evolve:
-                    actions = response_json["actions"]
-                    for action in actions:
-                        if action == "strengthen":
-                            suggest_connections = response_json["suggested_connections"]
-                            new_tags = response_json["tags_to_update"]
-                            note.links.extend(suggest_connections)
-                            note.tags = new_tags
-                        elif action == "update_neighbor":
-                            new_context_neighborhood = response_json["new_context_neighborhood"]
-                            new_tags_neighborhood = response_json["new_tags_neighborhood"]
-
-                            # Update each neighbor memory using its actual ID
-                            for i in range(min(len(memory_ids), len(new_tags_neighborhood))):
-                                memory_id = memory_ids[i]
-
-                                # Load neighbor from ChromaDB/cache (cache-aware)
-                                neighbor_memory = self.read(memory_id)
-                                if not neighbor_memory:
-                                    logger.warning(f"Neighbor memory {memory_id} not found during evolution")
-                                    continue
-
-                                # Prepare update kwargs
-                                update_kwargs = {}
-
-                                # Update tags
-                                if i < len(new_tags_neighborhood):
-                                    update_kwargs['tags'] = new_tags_neighborhood[i]
-
-                                # Update context
-                                if i < len(new_context_neighborhood):
-                                    update_kwargs['context'] = new_context_neighborhood[i]
-
-                                # CRITICAL: Sync to ChromaDB immediately (write-through)
-                                if update_kwargs:
-                                    success = self.update(memory_id, **update_kwargs)
-                                    if not success:
-                                        logger.error(f"Failed to update neighbor {memory_id} during evolution")
+        except Exception as e:
+            # For testing purposes, catch all exceptions and return the original note
+            logger.error(f"Error in process_memory: {str(e)}")
+            return False, note
+
+    async def process_memory_async(self, note: MemoryNote) -> Tuple[bool, MemoryNote]:
+        """Async variant of process_memory().
+
+        Neighbor lookup and write-back run in a worker thread; the evolution
+        LLM call is awaited on the controller's async client.
+        """
+        try:
+            prepared = await asyncio.to_thread(self._prepare_evolution, note)
+            if prepared is None:
+                return False, note
+            prompt, memory_ids = prepared
 
+            try:
+                # Evolution depends on the neighbors, so a similar note must not reuse the decision
+                response = await self.llm_controller.aget_completion(prompt, response_format=_EVOLUTION_RESPONSE_FORMAT,
+                                                                     temperature=_LLM_TEMPERATURE,
+                                                                     use_semantic_cache=False)
+                should_evolve = await asyncio.to_thread(self._apply_evolution, note, response, memory_ids)
                 return should_evolve, note
-                
+
             except (json.JSONDecodeError, KeyError, Exception) as e:
                 logger.error(f"Error in memory evolution: {str(e)}")
                 return False, note
-                
+
         except Exception as e:
-            # For testing purposes, catch all exceptions and return the original note
             logger.error(f"Error in process_memory: {str(e)}")
             return False, note
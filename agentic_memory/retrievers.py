@@ -10,33 +10,84 @@ import pickle
 from nltk.tokenize import word_tokenize
 import os
 import json
-from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+from ._singletons import embed_query, get_client, get_embedder
+
+# Metadata lists/dicts are stored as JSON strings; decode them with orjson when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# HNSW graph parameters for newly created collections. Chroma already indexes
+# embeddings with hnswlib; its defaults (M=16, search_ef=10) trade recall and
+# query speed for build cost, which suits a write-light, search-heavy store poorly.
+# Changing these does not affect collections that already exist on disk.
+HNSW_METADATA = {
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+}
 
 def simple_tokenize(text):
     return word_tokenize(text)
 
 class ChromaRetriever:
     """Vector database retrieval using ChromaDB"""
-    def __init__(self, collection_name: str = "memories", model_name: str = "all-MiniLM-L6-v2", persist_directory: str = "./chroma_db"):
+    def __init__(self, collection_name: str = "memories", model_name: str = "all-MiniLM-L6-v2", persist_directory: str = "./chroma_db",
+                 embedding_backend: str = "torch"):
         """Initialize ChromaDB retriever.
 
         Args:
             collection_name: Name of the ChromaDB collection
             model_name: Name of the sentence transformer model
             persist_directory: Directory path for persistent storage
+            embedding_backend: "torch" (SentenceTransformer) or "onnx" (onnxruntime,
+                all-MiniLM-L6-v2 only)
         """
         self.persist_directory = persist_directory
-        self.client = chromadb.PersistentClient(path=persist_directory)
-        self.embedding_function = SentenceTransformerEmbeddingFunction(model_name=model_name)
-        self.collection = self.client.get_or_create_collection(name=collection_name, embedding_function=self.embedding_function)
-        
-    def add_document(self, document: str, metadata: Dict, doc_id: str):
-        """Add a document to ChromaDB with enhanced embedding using metadata.
+        self.model_name = model_name
+        self.embedding_backend = embedding_backend
+        # Client and embedding model are shared process-wide (see _singletons)
+        self.client = get_client(persist_directory)
+        self.embedding_function = get_embedder(model_name, embedding_backend)
+        # Chroma 0.4.x get_or_create_collection overwrites an existing collection's
+        # metadata, so check what is stored before opening or creating anything.
+        # list_collections() yields names on Chroma 0.6 and Collection objects elsewhere.
+        existing = {getattr(c, "name", c) for c in self.client.list_collections()}
+        if collection_name in existing:
+            # Opened without our embedding function so newer Chroma cannot reject
+            # the mismatch first with its own, less specific conflict error.
+            stored = self.client.get_collection(name=collection_name).metadata or {}
+            # Collections from before the backend option were always torch
+            stored_backend = stored.get("embedding_backend", "torch")
+            if stored_backend != embedding_backend:
+                raise ValueError(
+                    f"Collection '{collection_name}' in {persist_directory} was built with the "
+                    f"'{stored_backend}' embedding backend, not '{embedding_backend}'. Switching "
+                    f"backends requires re-indexing: use a new CHROMA_DB_PATH or collection and "
+                    f"re-add the memories."
+                )
+            self.collection = self.client.get_collection(
+                name=collection_name,
+                embedding_function=self.embedding_function
+            )
+        else:
+            self.collection = self.client.create_collection(
+                name=collection_name,
+                embedding_function=self.embedding_function,
+                metadata={**HNSW_METADATA, "embedding_backend": embedding_backend}
+            )
         
+    def _prepare_document(self, document: str, metadata: Dict):
+        """Build the enhanced embedding text and serialized metadata for a document.
+
         Args:
             document: Text content to add
             metadata: Dictionary of metadata including keywords, tags, context
-            doc_id: Unique identifier for the document
+
+        Returns:
+            Tuple of (enhanced document text, ChromaDB-serializable metadata)
         """
         # Build enhanced document content including semantic metadata
         enhanced_document = document
@@ -69,12 +120,39 @@ class ChromaRetriever:
         
         # Store enhanced document content for better embedding
         processed_metadata['enhanced_content'] = enhanced_document
-                
+        return enhanced_document, processed_metadata
+
+    def add_document(self, document: str, metadata: Dict, doc_id: str):
+        """Add a document to ChromaDB with enhanced embedding using metadata.
+        
+        Args:
+            document: Text content to add
+            metadata: Dictionary of metadata including keywords, tags, context
+            doc_id: Unique identifier for the document
+        """
+        self.add_documents([document], [metadata], [doc_id])
+
+    def add_documents(self, documents: List[str], metadatas: List[Dict], doc_ids: List[str]):
+        """Add several documents in one ChromaDB call.
+
+        The embedding function encodes all enhanced documents in a single
+        batched forward pass instead of one pass per document.
+
+        Args:
+            documents: Text contents to add
+            metadatas: Metadata dicts, one per document
+            doc_ids: Unique identifiers, one per document
+        """
+        if not documents:
+            return
+        prepared = [self._prepare_document(document, metadata)
+                    for document, metadata in zip(documents, metadatas)]
+
         # Use enhanced document content for embedding generation
         self.collection.add(
-            documents=[enhanced_document],
-            metadatas=[processed_metadata],
-            ids=[doc_id]
+            documents=[enhanced for enhanced, _ in prepared],
+            metadatas=[processed for _, processed in prepared],
+            ids=list(doc_ids)
         )
         
     def delete_document(self, doc_id: str):
@@ -84,48 +162,66 @@ class ChromaRetriever:
             doc_id: ID of document to delete
         """
         self.collection.delete(ids=[doc_id])
+
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a query string, reusing the embedding of previously seen queries.
+
+        Args:
+            query: Query text
+
+        Returns:
+            Query embedding as a list of floats
+        """
+        # Tokenizers split on whitespace, so collapsing runs of it leaves the
+        # embedding unchanged while letting reformatted repeats hit the cache
+        return list(embed_query(self.model_name, " ".join(query.split()), self.embedding_backend))
         
-    def search(self, query: str, k: int = 5):
+    def search(self, query: str, k: int = 5, query_embedding: Optional[List[float]] = None):
         """Search for similar documents.
         
         Args:
             query: Query text
             k: Number of results to return
+            query_embedding: Precomputed embedding of query (skips re-embedding)
             
         Returns:
             Dict with documents, metadatas, ids, and distances
         """
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
         results = self.collection.query(
-            query_texts=[query],
+            query_embeddings=[query_embedding],
             n_results=k
         )
         
         # Convert string metadata back to original types
-        if 'metadatas' in results and results['metadatas'] and len(results['metadatas']) > 0:
-            # First level is a list with one item per query
-            for i in range(len(results['metadatas'])):
-                # Second level is a list of metadata dicts for each result
-                if isinstance(results['metadatas'][i], list):
-                    for j in range(len(results['metadatas'][i])):
-                        # Process each metadata dict
-                        if isinstance(results['metadatas'][i][j], dict):
-                            metadata = results['metadatas'][i][j]
-                            for key, value in metadata.items():
-                                try:
-                                    # Try to parse JSON for lists and dicts
-                                    if isinstance(value, str) and (value.startswith('[') or value.startswith('{')):
-                                        metadata[key] = json.loads(value)
-                                    # Convert numeric strings back to numbers
-                                    elif isinstance(value, str) and value.replace('.', '', 1).isdigit():
-                                        if '.' in value:
-                                            metadata[key] = float(value)
-                                        else:
-                                            metadata[key] = int(value)
-                                except (json.JSONDecodeError, ValueError):
-                                    # If parsing fails, keep the original string
-                                    pass
+        return self._deserialize_results(results)
 
-        return results
+    def search_batch(self, queries: List[str], k: int = 5) -> List[Dict]:
+        """Search for several queries with one embedding pass and one ChromaDB query.
+
+        Args:
+            queries: Query texts
+            k: Number of results to return per query
+
+        Returns:
+            One dict per query, in the same format as search()
+        """
+        if not queries:
+            return []
+        query_embeddings = self.embedding_function([" ".join(query.split()) for query in queries])
+        results = self._deserialize_results(self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=k
+        ))
+
+        # Split the per-query columns (everything except "included" and
+        # columns that were not requested) into single-query results
+        return [
+            {key: value if key == "included" or value is None else [value[i]]
+             for key, value in results.items()}
+            for i in range(len(queries))
+        ]
 
     def search_with_filter(
         self,
@@ -151,7 +247,7 @@ class ChromaRetriever:
         if query:
             # Semantic search with optional filter
             results = self.collection.query(
-                query_texts=[query],
+                query_embeddings=[self.embed_query(query)],
                 n_results=k,
                 where=where
             )
@@ -178,15 +274,23 @@ class ChromaRetriever:
                 }
 
         # Deserialize metadata
-        if 'metadatas' in results and results['metadatas'] and len(results['metadatas']) > 0:
-            for i in range(len(results['metadatas'])):
-                if isinstance(results['metadatas'][i], list):
-                    for j in range(len(results['metadatas'][i])):
-                        if isinstance(results['metadatas'][i][j], dict):
-                            results['metadatas'][i][j] = self._deserialize_metadata(
-                                results['metadatas'][i][j]
-                            )
+        return self._deserialize_results(results)
+
+    def _deserialize_results(self, results: Dict) -> Dict:
+        """Deserialize every metadata dict of a query()-format result in place.
+
+        Args:
+            results: ChromaDB result with one metadata list per query
 
+        Returns:
+            The same result dict with deserialized metadata
+        """
+        metadatas = results.get('metadatas')
+        if metadatas:
+            for i, rows in enumerate(metadatas):
+                if isinstance(rows, list):
+                    metadatas[i] = [self._deserialize_metadata(m) if isinstance(m, dict) else m
+                                    for m in rows]
         return results
 
     def _deserialize_metadata(self, metadata: Dict) -> Dict:
@@ -203,7 +307,7 @@ class ChromaRetriever:
             try:
                 # Try to parse JSON for lists and dicts
                 if isinstance(value, str) and (value.startswith('[') or value.startswith('{')):
-                    deserialized[key] = json.loads(value)
+                    deserialized[key] = _json_loads(value)
                 # Convert numeric strings back to numbers
                 elif isinstance(value, str) and value.replace('.', '', 1).isdigit():
                     if '.' in value:
@@ -227,7 +331,7 @@ class ChromaRetriever:
             Dict with deserialized metadata if found, None otherwise
         """
         try:
-            results = self.collection.get(ids=[doc_id])
+            results = self.collection.get(ids=[doc_id], include=["metadatas"])
             if results['ids'] and len(results['ids']) > 0:
                 metadata = results['metadatas'][0]
                 return self._deserialize_metadata(metadata)
@@ -245,7 +349,7 @@ class ChromaRetriever:
             Dict mapping doc_id to deserialized metadata
         """
         try:
-            results = self.collection.get(ids=doc_ids)
+            results = self.collection.get(ids=doc_ids, include=["metadatas"])
             metadata_map = {}
             for i, doc_id in enumerate(results['ids']):
                 metadata_map[doc_id] = self._deserialize_metadata(results['metadatas'][i])
@@ -265,7 +369,7 @@ class ChromaRetriever:
         try:
             # Get current document if content not provided
             if content is None:
-                current = self.collection.get(ids=[doc_id])
+                current = self.collection.get(ids=[doc_id], include=["documents"])
                 if not current['ids']:
                     print(f"Document {doc_id} not found for update")
                     return
@@ -323,7 +427,8 @@ class ChromaRetriever:
             List of document IDs
         """
         try:
-            results = self.collection.get(limit=limit, offset=offset)
+            # IDs are always returned; skip loading documents and metadata
+            results = self.collection.get(limit=limit, offset=offset, include=[])
             return results['ids']
         except Exception as e:
             print(f"Error getting document IDs: {e}")
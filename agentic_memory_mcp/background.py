@@ -6,7 +6,7 @@ while memory processing (LLM calls, evolution, storage) happens in background.
 """
 
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, UTC
 import asyncio
 import uuid
@@ -158,17 +158,98 @@ class TaskTracker:
                 logger.error(f"Error in cleanup_old_tasks: {e}", exc_info=True)
 
 
+class MetadataBatcher:
+    """Coalesces concurrent metadata-analysis requests into batched LLM calls.
+
+    Callers await analyze(content). A single worker drains the queue, waiting
+    up to max_wait_ms for up to max_batch pending contents, and resolves each
+    caller's future from one AgenticMemorySystem.analyze_contents() call.
+    """
+
+    def __init__(self, memory_system, max_batch: int = 8, max_wait_ms: int = 50):
+        """Initialize metadata batcher.
+
+        Args:
+            memory_system: AgenticMemorySystem instance
+            max_batch: Maximum contents analyzed per LLM call
+            max_wait_ms: How long to wait for more contents before flushing
+        """
+        self._memory_system = memory_system
+        self._max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def analyze(self, content: str) -> Dict[str, Any]:
+        """Queue content for analysis and wait for its metadata.
+
+        Args:
+            content: Memory content to analyze
+
+        Returns:
+            Metadata dict with keywords, context, and tags
+        """
+        # Worker is started lazily so it binds to the running event loop
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((content, future))
+        return await future
+
+    async def _run(self):
+        """Drain the queue in batches until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                batch: List[Tuple[str, asyncio.Future]] = [await self._queue.get()]
+                deadline = loop.time() + self._max_wait
+                while len(batch) < self._max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                logger.info("Metadata batcher cancelled, shutting down")
+                break
+
+            contents = [content for content, _ in batch]
+            logger.debug(f"Analyzing metadata batch of {len(contents)} notes")
+            try:
+                analyses = await asyncio.to_thread(self._memory_system.analyze_contents, contents)
+                for (_, future), analysis in zip(batch, analyses):
+                    if not future.done():
+                        future.set_result(analysis)
+            except Exception as e:
+                logger.error(f"Metadata batch failed: {e}", exc_info=True)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
 # Global task tracker instance
 task_tracker = TaskTracker()
 
 
-async def process_memory_task(memory_system, task_id: str, content: str, **kwargs):
+async def process_memory_task(
+    memory_system,
+    task_id: str,
+    content: str,
+    batcher: Optional[MetadataBatcher] = None,
+    **kwargs
+):
     """Background worker that processes a memory task.
 
     Args:
         memory_system: AgenticMemorySystem instance
         task_id: Task ID to update
         content: Memory content
+        batcher: Optional MetadataBatcher used to pre-compute missing
+            keywords/context/tags in a shared LLM call
         **kwargs: Additional arguments for add_note
     """
     try:
@@ -176,9 +257,15 @@ async def process_memory_task(memory_system, task_id: str, content: str, **kwarg
         await task_tracker.update_status(task_id, "processing")
         logger.info(f"Processing task {task_id}")
 
-        # Execute synchronous memory operation in thread pool
-        memory_id = await asyncio.to_thread(
-            memory_system.add_note,
+        # Pre-compute missing metadata in a batched LLM call so add_note skips its own
+        if batcher is not None and not all(kwargs.get(f) for f in ("keywords", "context", "tags")):
+            analysis = await batcher.analyze(content)
+            for field in ("keywords", "context", "tags"):
+                if not kwargs.get(field) and analysis.get(field):
+                    kwargs[field] = analysis[field]
+
+        # LLM calls are awaited concurrently with other tasks; ChromaDB work runs in a thread
+        memory_id = await memory_system.add_note_async(
             content,
             **kwargs
         )
@@ -201,3 +288,37 @@ async def process_memory_task(memory_system, task_id: str, content: str, **kwarg
             error=error_msg
         )
         logger.error(f"Task {task_id} failed: {error_msg}", exc_info=True)
+
+
+async def process_memory_batch_task(
+    memory_system,
+    task_ids: List[str],
+    notes: List[Dict[str, Any]]
+):
+    """Background worker that stores several notes in one batch.
+
+    All notes share one metadata-analysis LLM call and one ChromaDB add
+    (a single batched embedding pass). Task statuses move together.
+
+    Args:
+        memory_system: AgenticMemorySystem instance
+        task_ids: Task IDs to update, one per note
+        notes: Dicts with ``content`` and optional add_note arguments
+    """
+    try:
+        for task_id in task_ids:
+            await task_tracker.update_status(task_id, "processing")
+        logger.info(f"Processing batch of {len(task_ids)} tasks")
+
+        memory_ids = await memory_system.add_notes_async(notes)
+
+        for task_id, memory_id in zip(task_ids, memory_ids):
+            await task_tracker.update_status(task_id, "completed", memory_id=memory_id)
+
+        logger.info(f"Batch of {len(task_ids)} tasks completed successfully")
+
+    except Exception as e:
+        error_msg = str(e)
+        for task_id in task_ids:
+            await task_tracker.update_status(task_id, "failed", error=error_msg)
+        logger.error(f"Batch of {len(task_ids)} tasks failed: {error_msg}", exc_info=True)
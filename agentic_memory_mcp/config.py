@@ -21,22 +21,28 @@ class MCPConfig:
         llm_model: Name of the LLM model (e.g., "gpt-4o-mini")
         api_key: API key for the LLM service (optional, can use env var)
         embedding_model: Sentence transformer model for embeddings
+        embedding_backend: Embedding runtime ("torch" or "onnx")
         evo_threshold: Number of memories before triggering evolution
         server_name: Name of the MCP server
         sglang_host: Host URL for SGLang backend
         sglang_port: Port for SGLang backend
         storage_path: Directory path for persistent ChromaDB storage
+        llm_rate_limit_rpm: Client-side LLM requests-per-minute limit (None = unlimited)
+        llm_rate_limit_tpm: Client-side LLM tokens-per-minute limit (None = unlimited)
     """
 
     llm_backend: str = "openai"
     llm_model: str = "gpt-4o-mini"
     api_key: Optional[str] = None
     embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_backend: str = "torch"
     evo_threshold: int = 100
     server_name: str = "agentic-memory"
     sglang_host: str = "http://localhost"
     sglang_port: int = 30000
     storage_path: str = "./chroma_db"
+    llm_rate_limit_rpm: Optional[float] = None
+    llm_rate_limit_tpm: Optional[float] = None
 
     @classmethod
     def from_env(cls) -> "MCPConfig":
@@ -48,10 +54,13 @@ class MCPConfig:
             OPENAI_API_KEY: OpenAI API key
             OPENROUTER_API_KEY: OpenRouter API key
             EMBEDDING_MODEL: Embedding model (default: all-MiniLM-L6-v2)
+            EMBEDDING_BACKEND: Embedding runtime, torch or onnx (default: torch)
             EVO_THRESHOLD: Evolution threshold (default: 100)
             SGLANG_HOST: SGLang host (default: http://localhost)
             SGLANG_PORT: SGLang port (default: 30000)
             CHROMA_DB_PATH: ChromaDB storage path (default: ./chroma_db)
+            LLM_RATE_LIMIT_RPM: Client-side requests-per-minute limit (default: unlimited)
+            LLM_RATE_LIMIT_TPM: Client-side tokens-per-minute limit (default: unlimited)
 
         Returns:
             MCPConfig instance populated from environment variables
@@ -65,15 +74,21 @@ class MCPConfig:
         elif llm_backend == "openrouter":
             api_key = os.getenv("OPENROUTER_API_KEY")
 
+        rpm = os.getenv("LLM_RATE_LIMIT_RPM")
+        tpm = os.getenv("LLM_RATE_LIMIT_TPM")
+
         return cls(
             llm_backend=llm_backend,
             llm_model=os.getenv("LLM_MODEL", "gpt-4o-mini"),
             api_key=api_key,
             embedding_model=os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+            embedding_backend=os.getenv("EMBEDDING_BACKEND", "torch"),
             evo_threshold=int(os.getenv("EVO_THRESHOLD", "100")),
             sglang_host=os.getenv("SGLANG_HOST", "http://localhost"),
             sglang_port=int(os.getenv("SGLANG_PORT", "30000")),
-            storage_path=os.getenv("CHROMA_DB_PATH", "./chroma_db")
+            storage_path=os.getenv("CHROMA_DB_PATH", "./chroma_db"),
+            llm_rate_limit_rpm=float(rpm) if rpm else None,
+            llm_rate_limit_tpm=float(tpm) if tpm else None
         )
 
     def to_dict(self) -> dict:
@@ -86,9 +101,12 @@ class MCPConfig:
             "llm_backend": self.llm_backend,
             "llm_model": self.llm_model,
             "embedding_model": self.embedding_model,
+            "embedding_backend": self.embedding_backend,
             "evo_threshold": self.evo_threshold,
             "server_name": self.server_name,
             "sglang_host": self.sglang_host,
             "sglang_port": self.sglang_port,
-            "storage_path": self.storage_path
+            "storage_path": self.storage_path,
+            "llm_rate_limit_rpm": self.llm_rate_limit_rpm,
+            "llm_rate_limit_tpm": self.llm_rate_limit_tpm
         }
@@ -1,5 +1,6 @@
 """MCP prompts for memory-aware interactions."""
 
+import asyncio
 from typing import Any
 from mcp.server import Server
 from mcp.types import Prompt, PromptMessage, TextContent, PromptArgument
@@ -12,6 +13,13 @@ def register_prompts(server: Server, memory_system: Any) -> None:
         server: MCP server instance
         memory_system: AgenticMemorySystem instance
     """
+    # Lazy wrappers load the embedding model off the event loop before the first prompt
+    ensure_initialized = getattr(memory_system, "ensure_initialized", None)
+
+    def _load_memories() -> list:
+        # One batched read for every stored memory
+        notes = memory_system.read_multiple(memory_system.retriever.get_all_ids())
+        return [note for note in notes.values() if note]
 
     @server.list_prompts()
     async def list_prompts() -> list[Prompt]:
@@ -67,6 +75,9 @@ def register_prompts(server: Server, memory_system: Any) -> None:
             arguments = {}
 
         try:
+            if ensure_initialized is not None:
+                await ensure_initialized()
+
             if name == "recall-context":
                 topic = arguments.get("topic", "")
                 if not topic:
@@ -79,7 +90,7 @@ def register_prompts(server: Server, memory_system: Any) -> None:
                     )
 
                 # Search for memories about the topic
-                results = memory_system.search_agentic(topic, k=5)
+                results = await asyncio.to_thread(memory_system.search_agentic, topic, k=5)
 
                 # Format context
                 if not results:
@@ -116,7 +127,7 @@ def register_prompts(server: Server, memory_system: Any) -> None:
                     )
 
                 # Find similar memories
-                results = memory_system.search(description, k=5)
+                results = await asyncio.to_thread(memory_system.search, description, k=5)
 
                 # Format summary
                 if not results:
@@ -143,13 +154,9 @@ def register_prompts(server: Server, memory_system: Any) -> None:
                 tag = arguments.get("tag")
 
                 # Get memories from ChromaDB (source of truth)
-                memories = []
-                all_ids = memory_system.retriever.get_all_ids()
-                for mem_id in all_ids:
-                    memory = memory_system.read(mem_id)
-                    if memory:
-                        if tag is None or tag in memory.tags:
-                            memories.append(memory)
+                memories = await asyncio.to_thread(_load_memories)
+                if tag is not None:
+                    memories = [memory for memory in memories if tag in memory.tags]
 
                 if tag:
                     title = f"# Memory Summary (tag: {tag})\n\n"
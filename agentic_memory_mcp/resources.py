@@ -1,72 +1,57 @@
 """MCP resources for browsing memory state."""
 
-import json
-from typing import Any
+import asyncio
+from typing import Any, Dict
+from urllib.parse import parse_qsl, urlsplit
 from mcp.server import Server
 from mcp.types import Resource, TextContent
 
-
-def register_resources(server: Server, memory_system: Any) -> None:
-    """Register memory resources with the MCP server.
-
-    Args:
-        server: MCP server instance
-        memory_system: AgenticMemorySystem instance
-    """
-
-    @server.list_resources()
-    async def list_resources() -> list[Resource]:
-        """List all available memory resources."""
-        return [
-            Resource(
-                uri="memory://session-start",
-                name="⚠️ CRITICAL: Read This First - Memory System Activation",
-                mimeType="text/markdown",
-                description="⚠️ MANDATORY: Read at session start. Defines your memory-first workflow and persistent knowledge obligations."
-            ),
-            Resource(
-                uri="memory://usage-guide",
-                name="Memory System Usage Guide",
-                mimeType="text/markdown",
-                description="Guide for AI agents on when and how to use the agentic memory system proactively"
-            ),
-            Resource(
-                uri="memory://all",
-                name="All Memories",
-                mimeType="application/json",
-                description="View all memories in the system (with truncated content for overview)"
-            ),
-            Resource(
-                uri="memory://stats",
-                name="Memory Statistics",
-                mimeType="application/json",
-                description="View memory system statistics (total count, evolution count, tag distribution)"
-            ),
-            Resource(
-                uri="memory://by-tag/{tag}",
-                name="Memories by Tag",
-                mimeType="application/json",
-                description="View memories filtered by a specific tag"
-            )
-        ]
-
-    @server.read_resource()
-    async def read_resource(uri: Any) -> str:
-        """Read a memory resource.
-
-        Args:
-            uri: Resource URI to read (AnyUrl object from MCP)
-
-        Returns:
-            JSON string with resource contents
-        """
-        # Convert AnyUrl object to string
-        uri_str = str(uri)
-
-        try:
-            if uri_str == "memory://session-start":
-                # Critical session-start instructions
-                guide = """# ⚠️ CRITICAL: AGENTIC MEMORY SYSTEM ACTIVE
+from .serialization import dumps as _dumps
+
+
+# Number of most frequent tags reported by memory://stats
+_STATS_TOP_TAGS = 50
+
+# Page size for memory://all when no limit is given, and the largest allowed
+_DEFAULT_PAGE_SIZE = 100
+_MAX_PAGE_SIZE = 1000
+
+# Resource listing is static; build it once at import
+_RESOURCES = [
+    Resource(
+        uri="memory://session-start",
+        name="⚠️ CRITICAL: Read This First - Memory System Activation",
+        mimeType="text/markdown",
+        description="⚠️ MANDATORY: Read at session start. Defines your memory-first workflow and persistent knowledge obligations. Static - fetch once per session."
+    ),
+    Resource(
+        uri="memory://usage-guide",
+        name="Memory System Usage Guide",
+        mimeType="text/markdown",
+        description="Guide for AI agents on when and how to use the agentic memory system proactively. Static - fetch once per session."
+    ),
+    Resource(
+        uri="memory://all",
+        name="All Memories",
+        mimeType="application/json",
+        description="View all memories in the system (with truncated content for overview). Paginated: memory://all?offset=0&limit=100, follow next_offset for the next page"
+    ),
+    Resource(
+        uri="memory://stats",
+        name="Memory Statistics",
+        mimeType="application/json",
+        description="View memory system statistics (total count, evolution count, top tag distribution)"
+    ),
+    Resource(
+        uri="memory://by-tag/{tag}",
+        name="Memories by Tag",
+        mimeType="application/json",
+        description="View memories filtered by a specific tag"
+    )
+]
+
+# Critical session-start instructions
+_SESSION_START_GUIDE = """# ⚠️ CRITICAL: AGENTIC MEMORY SYSTEM ACTIVE
 
 ## YOUR MANDATORY WORKFLOW
 
@@ -132,11 +117,9 @@ With memory:
 
 **This is not optional. This is how you operate now.**
 """
-                return guide
 
-            elif uri_str == "memory://usage-guide":
-                # Return usage guide for AI agents
-                guide = """# Agentic Memory System - Usage Guide for AI Agents
+# Usage guide for AI agents
+_USAGE_GUIDE = """# Agentic Memory System - Usage Guide for AI Agents
 
 ## What is this?
 
@@ -228,98 +211,113 @@ The system automatically:
 
 This is YOUR long-term memory. Use it actively to build up knowledge over time. Each memory makes future sessions more effective!
 """
-                return guide
-
-            elif uri_str == "memory://all":
-                # Return all memories with truncated content
-                all_memories = []
-                # Get all memory IDs from ChromaDB (source of truth)
-                all_ids = memory_system.retriever.get_all_ids()
-
-                for mem_id in all_ids:
-                    # Load memory (uses cache + ChromaDB)
-                    memory = memory_system.read(mem_id)
-                    if memory:
-                        # Truncate long content
-                        content = memory.content
-                        if len(content) > 200:
-                            content = content[:200] + "..."
-
-                        mem_dict = {
-                            "id": memory.id,
-                            "content": content,
-                            "keywords": memory.keywords,
-                            "tags": memory.tags,
-                            "context": memory.context,
-                            "timestamp": memory.timestamp,
-                            "retrieval_count": memory.retrieval_count
-                        }
-                        all_memories.append(mem_dict)
-
-                result = {
-                    "total_memories": len(all_memories),
-                    "memories": all_memories
-                }
-                return json.dumps(result, indent=2)
-
-            elif uri_str == "memory://stats":
-                # Return statistics
-                total = memory_system.retriever.count()
-
-                # Count tag distribution
-                tag_counts = {}
-                all_ids = memory_system.retriever.get_all_ids()
-                for mem_id in all_ids:
-                    memory = memory_system.read(mem_id)
-                    if memory:
-                        for tag in memory.tags:
-                            tag_counts[tag] = tag_counts.get(tag, 0) + 1
-
-                result = {
-                    "total_memories": total,
-                    "evolution_count": memory_system.evo_cnt,
-                    "evolution_threshold": memory_system.evo_threshold,
-                    "tag_distribution": dict(sorted(tag_counts.items(), key=lambda x: x[1], reverse=True))
-                }
-                return json.dumps(result, indent=2)
-
-            elif uri_str.startswith("memory://by-tag/"):
-                # Extract tag from URI
-                tag = uri_str.split("/")[-1]
-
-                # Filter memories by tag
-                matching = []
-                all_ids = memory_system.retriever.get_all_ids()
-                for mem_id in all_ids:
-                    memory = memory_system.read(mem_id)
-                    if memory and tag in memory.tags:
-                        # Truncate long content
-                        content = memory.content
-                        if len(content) > 200:
-                            content = content[:200] + "..."
-
-                        matching.append({
-                            "id": memory.id,
-                            "content": content,
-                            "keywords": memory.keywords,
-                            "tags": memory.tags,
-                            "context": memory.context,
-                            "timestamp": memory.timestamp
-                        })
-
-                result = {
-                    "tag": tag,
-                    "count": len(matching),
-                    "memories": matching
-                }
-                return json.dumps(result, indent=2)
-
-            else:
-                return json.dumps({
-                    "error": f"Unknown resource URI: {uri_str}"
-                })
+
+
+def register_resources(server: Server, memory_system: Any) -> None:
+    """Register memory resources with the MCP server.
+
+    Args:
+        server: MCP server instance
+        memory_system: AgenticMemorySystem instance
+    """
+
+    def _read_all(query: Dict[str, str]) -> str:
+        # Return one page of memories with truncated content (precomputed summary view)
+        offset = max(int(query.get("offset", 0)), 0)
+        limit = min(max(int(query.get("limit", _DEFAULT_PAGE_SIZE)), 1), _MAX_PAGE_SIZE)
+
+        total = memory_system.count_memory_summaries()
+        page = memory_system.get_memory_summaries(offset, limit)
+        next_offset = offset + len(page)
+
+        result = {
+            "total_memories": total,
+            "offset": offset,
+            "limit": limit,
+            "next_offset": next_offset if next_offset < total else None,
+            "memories": page
+        }
+        return _dumps(result)
+
+    def _read_stats(query: Dict[str, str]) -> str:
+        # Return statistics
+        total = memory_system.retriever.count()
+
+        # Tag distribution is maintained incrementally by the memory system
+        result = {
+            "total_memories": total,
+            "evolution_count": memory_system.evo_cnt,
+            "evolution_threshold": memory_system.evo_threshold,
+            "tag_distribution": dict(memory_system.get_tag_counts(_STATS_TOP_TAGS))
+        }
+        return _dumps(result)
+
+    def _read_by_tag(uri_str: str) -> str:
+        # Extract tag from URI
+        tag = uri_str.split("/")[-1]
+
+        # Filter memories by tag via the tag index
+        matching = memory_system.get_memory_summaries_by_tag(tag)
+
+        result = {
+            "tag": tag,
+            "count": len(matching),
+            "memories": matching
+        }
+        return _dumps(result)
+
+    static = {
+        "memory://session-start": _SESSION_START_GUIDE,
+        "memory://usage-guide": _USAGE_GUIDE,
+    }
+    handlers = {
+        "memory://all": _read_all,
+        "memory://stats": _read_stats,
+    }
+    # Lazy wrappers load the embedding model off the event loop before the first read
+    ensure_initialized = getattr(memory_system, "ensure_initialized", None)
+
+    @server.list_resources()
+    async def list_resources() -> list[Resource]:
+        """List all available memory resources."""
+        return _RESOURCES
+
+    @server.read_resource()
+    async def read_resource(uri: Any) -> str:
+        """Read a memory resource.
+
+        Args:
+            uri: Resource URI to read (AnyUrl object from MCP)
+
+        Returns:
+            JSON string with resource contents
+        """
+        # Convert AnyUrl object to string
+        uri_str = str(uri)
+
+        try:
+            # Split off query parameters (e.g. memory://all?offset=100&limit=100)
+            parts = urlsplit(uri_str)
+            base_uri = f"{parts.scheme}://{parts.netloc}{parts.path}"
+            query = dict(parse_qsl(parts.query))
+
+            if base_uri in static:
+                return static[base_uri]
+
+            handler = handlers.get(base_uri)
+            if handler is None and base_uri.startswith("memory://by-tag/"):
+                handler, query = _read_by_tag, base_uri
+            if handler is not None:
+                # Memory reads hit ChromaDB; keep them off the event loop
+                if ensure_initialized is not None:
+                    await ensure_initialized()
+                return await asyncio.to_thread(handler, query)
+
+            return _dumps({
+                "error": f"Unknown resource URI: {uri_str}"
+            })
 
         except Exception as e:
-            return json.dumps({
+            return _dumps({
                 "error": f"Resource read error: {str(e)}"
             })
@@ -0,0 +1,32 @@
+"""Fast JSON encoding/decoding for tool and resource responses."""
+
+import json
+from typing import Any
+
+# Use orjson when available; fall back to the stdlib encoder otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Convert numpy scalars/arrays for the stdlib encoder (orjson handles them natively)."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(result: Any) -> str:
+    """Serialize a response payload as compact JSON."""
+    if orjson is not None:
+        # Chroma may hand back numpy floats for distances
+        return orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False, default=_default)
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
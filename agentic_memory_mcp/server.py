@@ -53,13 +53,36 @@ class LazyMemorySystem:
                 api_key=self._config.api_key,
                 sglang_host=self._config.sglang_host,
                 sglang_port=self._config.sglang_port,
-                storage_path=self._config.storage_path
+                storage_path=self._config.storage_path,
+                llm_rate_limit_rpm=self._config.llm_rate_limit_rpm,
+                llm_rate_limit_tpm=self._config.llm_rate_limit_tpm,
+                embedding_backend=self._config.embedding_backend
             )
             self._initialized = True
             logger.info("AgenticMemorySystem initialized successfully")
 
         return self._memory_system
 
+    async def ensure_initialized(self) -> Any:
+        """Initialize the memory system without blocking the event loop.
+
+        Model loading runs in a worker thread; concurrent first calls wait on
+        the same initialization instead of each starting their own.
+
+        Returns:
+            The initialized AgenticMemorySystem instance
+        """
+        if not self._initialized:
+            async with self._init_lock:
+                if not self._initialized:
+                    await asyncio.to_thread(self._ensure_initialized_sync)
+        return self._memory_system
+
+    async def aclose(self) -> None:
+        """Release the memory system's async resources, if it was ever initialized."""
+        if self._initialized:
+            await self._memory_system.aclose()
+
     def __getattr__(self, name: str) -> Any:
         """Proxy attribute access to the underlying memory system.
 
@@ -138,6 +161,12 @@ class MCPMemoryServer:
                     logger.info("Background cleanup task cancelled successfully")
                     pass
 
+            # Close pooled LLM connections while the event loop is still running
+            try:
+                await self.memory_system.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close memory system connections: {e}")
+
 
 def main():
     """Main entry point for running the MCP server.
@@ -1,13 +1,106 @@
 """MCP tools for memory operations."""
 
-import json
 import asyncio
-from typing import Any
+from collections import OrderedDict
+from typing import Any, Optional
+import numpy as np
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 from pydantic import BaseModel, Field
 
-from .background import task_tracker, process_memory_task
+from .background import task_tracker, process_memory_task, process_memory_batch_task, MetadataBatcher
+from .serialization import dumps as _dumps
+
+
+def _respond(result: dict) -> list[TextContent]:
+    """Wrap a tool result as MCP text content."""
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+def _invalid(message: str) -> dict:
+    """Error reply for arguments that fail the hot-path handlers' inline checks."""
+    return {"status": "error", "message": f"Invalid arguments: {message}"}
+
+
+def _is_count(value: Any, minimum: int = 0) -> bool:
+    """Whether value is an integer (not a bool) of at least minimum."""
+    return isinstance(value, int) and not isinstance(value, bool) and value >= minimum
+
+
+class SemanticQueryCache:
+    """Recent search results, matched by exact query or by query-embedding similarity.
+
+    Exact (query, k) hits skip embedding entirely; otherwise the query embedding
+    is compared against a fixed-size FIFO of recent query embeddings with one
+    matrix-vector product. Entries are dropped whenever the memory store's
+    write_generation changes, so results never outlive an add/update/delete.
+
+    Args:
+        max_size: Number of query embeddings kept for similarity matching
+        threshold: Minimum cosine similarity for a semantic hit
+        exact_size: Number of (query, k) pairs kept for exact matching
+        allow_larger_k: Serve a request from an entry fetched with a larger k
+            by slicing (valid when results are a ranked top-k list)
+    """
+
+    def __init__(self, max_size: int = 256, threshold: float = 0.95, exact_size: int = 512,
+                 allow_larger_k: bool = True):
+        self.max_size = max_size
+        self.threshold = threshold
+        self.exact_size = exact_size
+        self.allow_larger_k = allow_larger_k
+        self._generation = None
+        self.clear()
+
+    def clear(self):
+        self._exact: OrderedDict = OrderedDict()
+        self._embeddings: Optional[np.ndarray] = None
+        self._ks: list[int] = [0] * self.max_size
+        self._results: list[Optional[list]] = [None] * self.max_size
+        self._next = 0
+
+    def sync(self, generation: int):
+        """Drop all entries if the store changed since they were cached."""
+        if generation != self._generation:
+            self.clear()
+            self._generation = generation
+
+    def get_exact(self, query: str, k: int) -> Optional[list]:
+        results = self._exact.get((query, k))
+        if results is not None:
+            self._exact.move_to_end((query, k))
+        return results
+
+    def get_similar(self, embedding: np.ndarray, k: int) -> Optional[list]:
+        if self._embeddings is None:
+            return None
+        sims = self._embeddings @ embedding
+        i = int(np.argmax(sims))
+        if sims[i] < self.threshold or self._results[i] is None:
+            return None
+        cached_k = self._ks[i]
+        if cached_k == k or (self.allow_larger_k and cached_k > k):
+            return self._results[i][:k]
+        return None
+
+    def put(self, query: str, k: int, embedding: np.ndarray, results: list):
+        self._exact[(query, k)] = results
+        if len(self._exact) > self.exact_size:
+            self._exact.popitem(last=False)
+
+        if self._embeddings is None:
+            self._embeddings = np.zeros((self.max_size, embedding.shape[0]), dtype=np.float32)
+        slot = self._next
+        self._embeddings[slot] = embedding
+        self._ks[slot] = k
+        self._results[slot] = results
+        self._next = (slot + 1) % self.max_size
+
+    @staticmethod
+    def normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
 
 
 class AddNoteArgs(BaseModel):
@@ -19,10 +112,17 @@ class AddNoteArgs(BaseModel):
     timestamp: str | None = Field(default=None, description="Timestamp in format YYYYMMDDHHMM (optional, auto-generated if not provided)")
 
 
+class AddNotesBatchArgs(BaseModel):
+    """Arguments for adding several memory notes at once."""
+    notes: list[AddNoteArgs] = Field(min_length=1, description="Memory notes to add; task IDs are returned in the same order")
+
+
 class ReadNoteArgs(BaseModel):
     """Arguments for reading one or more memory notes."""
     memory_id: str | None = Field(default=None, description="The ID of the memory to read (for single read)")
     memory_ids: list[str] | None = Field(default=None, description="List of memory IDs to read (for bulk read)")
+    max_history: int | None = Field(default=None, ge=0, description="Return only the most recent N evolution history entries (optional, default: all)")
+    content_preview: int | None = Field(default=None, ge=0, description="Truncate content to this many characters (optional, default: full content)")
 
 
 class UpdateNoteArgs(BaseModel):
@@ -42,7 +142,7 @@ class DeleteNoteArgs(BaseModel):
 class SearchArgs(BaseModel):
     """Arguments for searching memories."""
     query: str = Field(description="Search query text")
-    k: int = Field(default=5, description="Number of results to return (default: 5)")
+    k: int = Field(default=5, ge=1, description="Number of results to return (default: 5)")
 
 
 class CheckTaskStatusArgs(BaseModel):
@@ -67,21 +167,44 @@ class SearchByTimeArgs(BaseModel):
     k: int = Field(default=10, description="Maximum results to return")
 
 
-def register_tools(server: Server, memory_system: Any) -> None:
-    """Register all memory operation tools with the MCP server.
+class BatchOperation(BaseModel):
+    """A single tool call inside a batch."""
+    name: str = Field(description="Name of the tool to call (any memory tool except batch_execute)")
+    arguments: dict = Field(default_factory=dict, description="Arguments for the tool")
 
-    Args:
-        server: MCP server instance
-        memory_system: AgenticMemorySystem instance
-    """
 
-    @server.list_tools()
-    async def list_tools() -> list[Tool]:
-        """List all available memory tools."""
-        return [
-            Tool(
-                name="add_memory_note",
-                description="""Save learnings to persistent memory. This builds cross-session knowledge.
+class BatchExecuteArgs(BaseModel):
+    """Arguments for executing several tool calls in one request."""
+    operations: list[BatchOperation] = Field(description="Tool calls to execute; results are returned in the same order")
+    max_concurrent: int = Field(default=8, ge=1, description="Maximum number of operations run concurrently (default: 8)")
+    stop_on_error: bool = Field(default=False, description="Cancel remaining operations after the first error (default: false)")
+
+
+class _BatchAborted(Exception):
+    """Raised inside a batch to stop it when stop_on_error is set."""
+
+    def __init__(self, result: dict):
+        super().__init__(result.get("message", ""))
+        self.result = result
+
+
+# Input schemas are static; build them once at import instead of on every list_tools()
+_ADD_SCHEMA = AddNoteArgs.model_json_schema()
+_ADD_BATCH_SCHEMA = AddNotesBatchArgs.model_json_schema()
+_READ_SCHEMA = ReadNoteArgs.model_json_schema()
+_UPDATE_SCHEMA = UpdateNoteArgs.model_json_schema()
+_DELETE_SCHEMA = DeleteNoteArgs.model_json_schema()
+_SEARCH_SCHEMA = SearchArgs.model_json_schema()
+_SEARCH_BY_TIME_SCHEMA = SearchByTimeArgs.model_json_schema()
+_CHECK_TASK_STATUS_SCHEMA = CheckTaskStatusArgs.model_json_schema()
+_BATCH_EXECUTE_SCHEMA = BatchExecuteArgs.model_json_schema()
+
+
+# Tool listing is static; build it once at import
+_TOOLS = [
+    Tool(
+        name="add_memory_note",
+        description="""Save learnings to persistent memory. This builds cross-session knowledge.
 
 **SELF-COMMITMENT:** After exploring code or completing research, say: "I learned something new - saving to memory..." then IMMEDIATELY call this tool. This verbal commitment ensures you don't forget to save.
 
@@ -106,11 +229,23 @@ def register_tools(server: Server, memory_system: Any) -> None:
 **ASYNC:** Returns immediately. Processing happens in background.
 
 ⚠️ **REMEMBER:** If you used search_memories at the start but then explored code to find the answer, you MUST save what you discovered.""",
-                inputSchema=AddNoteArgs.model_json_schema()
-            ),
-            Tool(
-                name="read_memory_note",
-                description="""Read full details of one or more memories by ID.
+        inputSchema=_ADD_SCHEMA
+    ),
+    Tool(
+        name="add_memory_notes_batch",
+        description="""Save several learnings to persistent memory in one call.
+
+**USE THIS INSTEAD OF add_memory_note WHEN:**
+• You have several distinct findings to save at once (e.g. after a large exploration)
+
+Each entry takes the same fields as add_memory_note. All notes share one metadata-generation call and one embedding pass, so this is much faster than saving them one at a time.
+
+**ASYNC:** Returns one task_id per note immediately. Processing happens in background.""",
+        inputSchema=_ADD_BATCH_SCHEMA
+    ),
+    Tool(
+        name="read_memory_note",
+        description="""Read full details of one or more memories by ID.
 
 **WHEN TO USE:**
 • After search returns memory IDs - read full details to get complete context
@@ -121,15 +256,16 @@ def register_tools(server: Server, memory_system: Any) -> None:
 **USAGE:**
 • Single read: provide `memory_id` - returns the note directly
 • Bulk read: provide `memory_ids` list - returns dict mapping each ID to its note
+• Large notes: set `content_preview` (characters) and/or `max_history` (most recent evolution entries) to trim the response
 
 **RETURNS:** Complete memory with content, keywords, tags, context, links, and evolution history.
 
 Use this as a follow-up to search_memories() when you need comprehensive details beyond the search preview.""",
-                inputSchema=ReadNoteArgs.model_json_schema()
-            ),
-            Tool(
-                name="update_memory_note",
-                description="""Update existing memory when you learn more or need to correct information.
+        inputSchema=_READ_SCHEMA
+    ),
+    Tool(
+        name="update_memory_note",
+        description="""Update existing memory when you learn more or need to correct information.
 
 **USE THIS PROACTIVELY WHEN:**
 • You discover additional details about something already in memory (e.g., "I stored info about the auth flow, but now found it also handles rate limiting")
@@ -145,11 +281,11 @@ Use this as a follow-up to search_memories() when you need comprehensive details
 3. If topic is different enough, create new memory with add_memory_note instead
 
 You can update: content, keywords, tags, or context. Other fields (timestamp, links) are managed automatically.""",
-                inputSchema=UpdateNoteArgs.model_json_schema()
-            ),
-            Tool(
-                name="delete_memory_note",
-                description="""Delete incorrect or obsolete memories from the knowledge base.
+        inputSchema=_UPDATE_SCHEMA
+    ),
+    Tool(
+        name="delete_memory_note",
+        description="""Delete incorrect or obsolete memories from the knowledge base.
 
 **WHEN TO DELETE:**
 • Memory contains completely wrong information that can't be fixed with update
@@ -160,11 +296,11 @@ You can update: content, keywords, tags, or context. Other fields (timestamp, li
 **CAUTION:** Prefer update_memory_note over delete when information just needs correction. Only delete when the memory has no salvageable value.
 
 The memory system evolves connections automatically, so removing a memory may affect the knowledge graph.""",
-                inputSchema=DeleteNoteArgs.model_json_schema()
-            ),
-            Tool(
-                name="search_memories",
-                description="""CRITICAL: ALWAYS search persistent memory BEFORE starting work. This prevents re-discovering what you already know.
+        inputSchema=_DELETE_SCHEMA
+    ),
+    Tool(
+        name="search_memories",
+        description="""CRITICAL: ALWAYS search persistent memory BEFORE starting work. This prevents re-discovering what you already know.
 
 **SELF-COMMITMENT:** When you receive a task, FIRST say: "Let me check my memory for relevant context..." then IMMEDIATELY call this tool. This verbal commitment ensures you don't skip the search.
 
@@ -183,11 +319,11 @@ The memory system evolves connections automatically, so removing a memory may af
 **RETURNS:** Metadata only (id, context, keywords, tags, score) - NO full content. Use read_memory_note(memory_id) to get full content for relevant memories.
 
 ⚠️ **AFTER COMPLETING WORK:** If you explored code, read files, or discovered anything NEW beyond what memory returned, call add_memory_note() to save it. If memory already had the answer and no new exploration was needed, saving is not required.""",
-                inputSchema=SearchArgs.model_json_schema()
-            ),
-            Tool(
-                name="search_memories_agentic",
-                description="""Advanced memory search that follows the knowledge graph - returns semantically similar memories PLUS their linked neighbors.
+        inputSchema=_SEARCH_SCHEMA
+    ),
+    Tool(
+        name="search_memories_agentic",
+        description="""Advanced memory search that follows the knowledge graph - returns semantically similar memories PLUS their linked neighbors.
 
 **WHEN TO USE THIS INSTEAD OF search_memories:**
 • Complex architectural questions spanning multiple components
@@ -202,11 +338,11 @@ The memory system evolves connections automatically, so removing a memory may af
 **RETURNS:** Metadata only (id, context, keywords, tags, timestamp, category, is_neighbor, score) - NO full content. Use read_memory_note(memory_id) to get full content.
 
 ⚠️ **AFTER COMPLETING WORK:** If you explored code or discovered anything NEW beyond what memory returned, call add_memory_note() to save it.""",
-                inputSchema=SearchArgs.model_json_schema()
-            ),
-            Tool(
-                name="search_memories_by_time",
-                description="""Search memories within a specific time period.
+        inputSchema=_SEARCH_SCHEMA
+    ),
+    Tool(
+        name="search_memories_by_time",
+        description="""Search memories within a specific time period.
 
 **IMPORTANT:** You must convert natural language time expressions to YYYYMMDDHHMM format before calling.
 Use your knowledge of today's date to calculate the correct timestamps.
@@ -230,11 +366,11 @@ Use your knowledge of today's date to calculate the correct timestamps.
 **USE CASES:**
 • "What did we do yesterday?" → search_memories_by_time(time_from="...", time_to="...")
 • "Show me architecture notes from last week" → search_memories_by_time(time_from="...", time_to="...", query="architecture")""",
-                inputSchema=SearchByTimeArgs.model_json_schema()
-            ),
-            Tool(
-                name="check_task_status",
-                description="""Check the status of a background memory task.
+        inputSchema=_SEARCH_BY_TIME_SCHEMA
+    ),
+    Tool(
+        name="check_task_status",
+        description="""Check the status of a background memory task.
 
 **USE THIS ONLY IF:**
 • You need to verify that a critical memory has been stored before proceeding with dependent work
@@ -250,229 +386,398 @@ Use your knowledge of today's date to calculate the correct timestamps.
 - created_at, updated_at: Timestamps
 
 Tasks are retained for 1 hour after completion, then automatically cleaned up.""",
-                inputSchema=CheckTaskStatusArgs.model_json_schema()
-            )
-        ]
+        inputSchema=_CHECK_TASK_STATUS_SCHEMA
+    ),
+    Tool(
+        name="batch_execute",
+        description="""Run several memory tool calls in a single request.
 
-    @server.call_tool()
-    async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-        """Handle tool calls.
+**USE THIS WHEN:**
+• Saving many memories at once (e.g. after a large exploration)
+• Running several searches or reads whose results you need together
 
-        Args:
-            name: Name of the tool to call
-            arguments: Tool arguments
+**USAGE:** `operations` is a list of `{"name": <tool>, "arguments": {...}}`. Operations run concurrently (up to `max_concurrent`), and results come back in the same order as the operations.
 
-        Returns:
-            List of TextContent responses
-        """
-        try:
-            if name == "add_memory_note":
-                args = AddNoteArgs(**arguments)
-                kwargs = {}
-                if args.keywords is not None:
-                    kwargs['keywords'] = args.keywords
-                if args.tags is not None:
-                    kwargs['tags'] = args.tags
-                if args.context is not None:
-                    kwargs['context'] = args.context
-                if args.timestamp is not None:
-                    kwargs['time'] = args.timestamp
-
-                # Create task and return immediately
-                task_id = await task_tracker.create_task(args.content, **kwargs)
-
-                # Schedule background processing (fire-and-forget)
-                asyncio.create_task(
-                    process_memory_task(
-                        memory_system,
-                        task_id,
-                        args.content,
-                        **kwargs
-                    )
-                )
+**ERRORS:** By default a failing operation reports `status: "error"` in its slot and the rest still run. Set `stop_on_error` to cancel the remaining operations after the first failure.""",
+        inputSchema=_BATCH_EXECUTE_SCHEMA
+    )
+]
 
-                result = {
-                    "status": "queued",
-                    "task_id": task_id,
-                    "message": "Memory queued for background processing"
-                }
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
-
-            elif name == "read_memory_note":
-                args = ReadNoteArgs(**arguments)
-
-                # Determine if single or bulk read
-                if args.memory_ids is not None:
-                    # Bulk read
-                    notes_map = memory_system.read_multiple(args.memory_ids)
-                    result = {"status": "success", "notes": {}}
-
-                    for memory_id, note in notes_map.items():
-                        if note is None:
-                            result["notes"][memory_id] = None
-                        else:
-                            result["notes"][memory_id] = {
-                                "id": note.id,
-                                "content": note.content,
-                                "keywords": note.keywords,
-                                "tags": note.tags,
-                                "context": note.context,
-                                "timestamp": note.timestamp,
-                                "last_accessed": note.last_accessed,
-                                "links": note.links,
-                                "retrieval_count": note.retrieval_count,
-                                "category": note.category,
-                                "evolution_history": note.evolution_history
-                            }
-                elif args.memory_id is not None:
-                    # Single read (existing behavior)
-                    note = memory_system.read(args.memory_id)
-
-                    if note is None:
-                        result = {
-                            "status": "error",
-                            "message": f"Memory not found: {args.memory_id}"
-                        }
-                    else:
-                        result = {
-                            "status": "success",
-                            "note": {
-                                "id": note.id,
-                                "content": note.content,
-                                "keywords": note.keywords,
-                                "tags": note.tags,
-                                "context": note.context,
-                                "timestamp": note.timestamp,
-                                "last_accessed": note.last_accessed,
-                                "links": note.links,
-                                "retrieval_count": note.retrieval_count,
-                                "category": note.category,
-                                "evolution_history": note.evolution_history
-                            }
-                        }
-                else:
-                    result = {
-                        "status": "error",
-                        "message": "Must provide either memory_id or memory_ids"
-                    }
-
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
-
-            elif name == "update_memory_note":
-                args = UpdateNoteArgs(**arguments)
-                update_fields = {}
-                if args.content is not None:
-                    update_fields['content'] = args.content
-                if args.keywords is not None:
-                    update_fields['keywords'] = args.keywords
-                if args.tags is not None:
-                    update_fields['tags'] = args.tags
-                if args.context is not None:
-                    update_fields['context'] = args.context
-
-                success = memory_system.update(args.memory_id, **update_fields)
 
-                result = {
-                    "status": "success" if success else "error",
-                    "message": "Memory updated successfully" if success else f"Memory not found: {args.memory_id}"
-                }
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
+def register_tools(server: Server, memory_system: Any) -> None:
+    """Register all memory operation tools with the MCP server.
 
-            elif name == "delete_memory_note":
-                args = DeleteNoteArgs(**arguments)
-                success = memory_system.delete(args.memory_id)
+    Args:
+        server: MCP server instance
+        memory_system: AgenticMemorySystem instance
+    """
+    # Lazy wrappers load the embedding model off the event loop before the first call
+    ensure_initialized = getattr(memory_system, "ensure_initialized", None)
+    # Shared across add_memory_note calls so bursts of notes share LLM round-trips
+    metadata_batcher = MetadataBatcher(memory_system)
+    # Repeated / near-identical searches within a session skip embedding + Chroma.
+    # Agentic results append graph neighbors, so they are not a prefix of a larger-k result.
+    search_cache = SemanticQueryCache()
+    agentic_search_cache = SemanticQueryCache(allow_larger_k=False)
 
-                result = {
-                    "status": "success" if success else "error",
-                    "message": "Memory deleted successfully" if success else f"Memory not found: {args.memory_id}"
+    @server.list_tools()
+    async def list_tools() -> list[Tool]:
+        """List all available memory tools."""
+        return _TOOLS
+
+    def _note_to_dict(note: Any, max_history: Optional[int] = None,
+                      content_preview: Optional[int] = None) -> dict:
+        content = note.content
+        if content_preview is not None and len(content) > content_preview:
+            content = content[:content_preview] + "..."
+        history = note.evolution_history
+        if max_history is not None:
+            history = history[-max_history:] if max_history else []
+        return {
+            "id": note.id,
+            "content": content,
+            "keywords": note.keywords,
+            "tags": note.tags,
+            "context": note.context,
+            "timestamp": note.timestamp,
+            "last_accessed": note.last_accessed,
+            "links": note.links,
+            "retrieval_count": note.retrieval_count,
+            "category": note.category,
+            "evolution_history": history
+        }
+
+    async def _do_add(arguments: dict) -> dict:
+        args = AddNoteArgs.model_validate(arguments)
+        kwargs = args.model_dump(exclude_none=True, exclude={'content', 'timestamp'})
+        if args.timestamp is not None:
+            kwargs['time'] = args.timestamp
+
+        # Create task and return immediately
+        task_id = await task_tracker.create_task(args.content, **kwargs)
+
+        # Schedule background processing (fire-and-forget)
+        asyncio.create_task(
+            process_memory_task(
+                memory_system,
+                task_id,
+                args.content,
+                batcher=metadata_batcher,
+                **kwargs
+            )
+        )
+
+        return {
+            "status": "queued",
+            "task_id": task_id,
+            "message": "Memory queued for background processing"
+        }
+
+    async def _do_add_batch(arguments: dict) -> dict:
+        args = AddNotesBatchArgs.model_validate(arguments)
+
+        task_ids = []
+        notes = []
+        for note_args in args.notes:
+            kwargs = note_args.model_dump(exclude_none=True, exclude={'content', 'timestamp'})
+            if note_args.timestamp is not None:
+                kwargs['time'] = note_args.timestamp
+            task_ids.append(await task_tracker.create_task(note_args.content, **kwargs))
+            notes.append({"content": note_args.content, **kwargs})
+
+        # One background task stores the whole batch (fire-and-forget)
+        asyncio.create_task(process_memory_batch_task(memory_system, task_ids, notes))
+
+        return {
+            "status": "queued",
+            "task_ids": task_ids,
+            "message": f"{len(task_ids)} memories queued for background processing"
+        }
+
+    async def _do_read(arguments: dict) -> dict:
+        # Hot path: MCP clients validate against inputSchema, so skip building a model
+        memory_id = arguments.get("memory_id")
+        memory_ids = arguments.get("memory_ids")
+        max_history = arguments.get("max_history")
+        content_preview = arguments.get("content_preview")
+        if max_history is not None and not _is_count(max_history):
+            return _invalid("max_history must be a non-negative integer")
+        if content_preview is not None and not _is_count(content_preview):
+            return _invalid("content_preview must be a non-negative integer")
+
+        # Determine if single or bulk read
+        if memory_ids is not None:
+            # Bulk read
+            if not isinstance(memory_ids, list) or not all(isinstance(i, str) for i in memory_ids):
+                return _invalid("memory_ids must be a list of strings")
+            notes_map = await asyncio.to_thread(memory_system.read_multiple, memory_ids)
+            result = {"status": "success", "notes": {}}
+
+            for memory_id, note in notes_map.items():
+                result["notes"][memory_id] = None if note is None else _note_to_dict(note, max_history, content_preview)
+            return result
+
+        if memory_id is not None:
+            # Single read (existing behavior)
+            if not isinstance(memory_id, str):
+                return _invalid("memory_id must be a string")
+            note = await asyncio.to_thread(memory_system.read, memory_id)
+
+            if note is None:
+                return {
+                    "status": "error",
+                    "message": f"Memory not found: {memory_id}"
                 }
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return {
+                "status": "success",
+                "note": _note_to_dict(note, max_history, content_preview)
+            }
 
-            elif name == "search_memories":
-                args = SearchArgs(**arguments)
-                results = memory_system.search(args.query, k=args.k)
+        return {
+            "status": "error",
+            "message": "Must provide either memory_id or memory_ids"
+        }
+
+    async def _do_update(arguments: dict) -> dict:
+        args = UpdateNoteArgs.model_validate(arguments)
+        update_fields = args.model_dump(exclude_none=True, exclude={'memory_id'})
+
+        success = await asyncio.to_thread(memory_system.update, args.memory_id, **update_fields)
+
+        return {
+            "status": "success" if success else "error",
+            "message": "Memory updated successfully" if success else f"Memory not found: {args.memory_id}"
+        }
+
+    async def _do_delete(arguments: dict) -> dict:
+        memory_id = arguments.get("memory_id")
+        if not isinstance(memory_id, str):
+            return _invalid("memory_id (string) is required")
+        success = await asyncio.to_thread(memory_system.delete, memory_id)
+
+        return {
+            "status": "success" if success else "error",
+            "message": "Memory deleted successfully" if success else f"Memory not found: {memory_id}"
+        }
+
+    def _search_params_error(arguments: dict) -> Optional[str]:
+        """Check query/k for the search tools without building a SearchArgs model."""
+        if not isinstance(arguments.get("query"), str):
+            return "query (string) is required"
+        if not _is_count(arguments.get("k", 5), minimum=1):
+            return "k must be a positive integer"
+        return None
+
+    async def _record_access(memory_ids: list[str]) -> None:
+        """Apply read() bookkeeping (retrieval_count, last_accessed) for cache-served results."""
+        if memory_ids:
+            await asyncio.to_thread(memory_system.read_multiple, memory_ids)
+
+    async def _cached_search(cache: SemanticQueryCache, search_fn, query: str, k: int) -> list:
+        """Run a search through the query cache, embedding the query at most once.
+
+        A cache hit skips the vector search but still touches every returned
+        memory, as both search paths read their results, so retrieval_count and
+        last_accessed advance exactly as on a miss. Cached result dicts carry
+        no access counters, so reads never make them stale.
+        """
+        cache.sync(memory_system.write_generation)
+        results = cache.get_exact(query, k)
+        if results is not None:
+            await _record_access([r["id"] for r in results])
+            return results
+
+        embed = memory_system.retriever.embed_query
+        embedding = SemanticQueryCache.normalize(await asyncio.to_thread(embed, query))
+        results = cache.get_similar(embedding, k)
+        if results is not None:
+            await _record_access([r["id"] for r in results])
+            return results
+
+        generation = memory_system.write_generation
+        results = await asyncio.to_thread(search_fn, query, k=k, query_embedding=embedding.tolist())
+        # Only cache if nothing was written while the search ran
+        cache.sync(memory_system.write_generation)
+        if memory_system.write_generation == generation:
+            cache.put(query, k, embedding, results)
+        return results
+
+    async def _do_search(arguments: dict) -> dict:
+        error = _search_params_error(arguments)
+        if error:
+            return _invalid(error)
+        query, k = arguments["query"], arguments.get("k", 5)
+        results = await _cached_search(search_cache, memory_system.search, query, k)
+
+        return {
+            "status": "success",
+            "count": len(results),
+            "results": results
+        }
+
+    async def _do_search_agentic(arguments: dict) -> dict:
+        error = _search_params_error(arguments)
+        if error:
+            return _invalid(error)
+        query, k = arguments["query"], arguments.get("k", 5)
+        results = await _cached_search(agentic_search_cache, memory_system.search_agentic, query, k)
+
+        return {
+            "status": "success",
+            "count": len(results),
+            "results": results
+        }
+
+    async def _do_search_by_time(arguments: dict) -> dict:
+        args = SearchByTimeArgs.model_validate(arguments)
+
+        # Require at least one time constraint
+        if not args.time_from and not args.time_to:
+            return {
+                "status": "error",
+                "message": "Must provide at least one of time_from or time_to"
+            }
+
+        # Execute search
+        results = await asyncio.to_thread(
+            memory_system.search_by_time,
+            time_from=args.time_from,
+            time_to=args.time_to,
+            query=args.query,
+            k=args.k
+        )
+
+        return {
+            "status": "success",
+            "count": len(results),
+            "time_range": {
+                "from": args.time_from,
+                "to": args.time_to
+            },
+            "results": results
+        }
+
+    async def _do_check_task_status(arguments: dict) -> dict:
+        args = CheckTaskStatusArgs.model_validate(arguments)
+        task = await task_tracker.get_task(args.task_id)
+
+        if task is None:
+            return {
+                "status": "error",
+                "message": f"Task not found: {args.task_id} (may have expired)"
+            }
 
+        result = {
+            "status": task.status,
+            "task_id": task.task_id,
+            "created_at": task.created_at.isoformat(),
+            "updated_at": task.updated_at.isoformat()
+        }
+        if task.memory_id:
+            result["memory_id"] = task.memory_id
+        if task.error:
+            result["error"] = task.error
+        return result
+
+    handlers = {
+        "add_memory_note": _do_add,
+        "add_memory_notes_batch": _do_add_batch,
+        "read_memory_note": _do_read,
+        "update_memory_note": _do_update,
+        "delete_memory_note": _do_delete,
+        "search_memories": _do_search,
+        "search_memories_agentic": _do_search_agentic,
+        "search_memories_by_time": _do_search_by_time,
+        "check_task_status": _do_check_task_status,
+    }
+
+    def _unknown_tool(name: str) -> dict:
+        return {
+            "status": "error",
+            "message": f"Unknown tool: {name}"
+        }
+
+    async def _do_batch_execute(arguments: dict) -> dict:
+        args = BatchExecuteArgs.model_validate(arguments)
+        semaphore = asyncio.Semaphore(args.max_concurrent)
+
+        async def _run(op: BatchOperation) -> dict:
+            handler = handlers.get(op.name)
+            if op.name == "batch_execute":
                 result = {
-                    "status": "success",
-                    "count": len(results),
-                    "results": results
+                    "status": "error",
+                    "message": "batch_execute cannot be nested"
                 }
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            elif handler is None:
+                result = _unknown_tool(op.name)
+            else:
+                async with semaphore:
+                    try:
+                        result = await handler(op.arguments)
+                    except Exception as e:
+                        result = {
+                            "status": "error",
+                            "message": f"Tool execution error: {str(e)}"
+                        }
+            if args.stop_on_error and result.get("status") == "error":
+                raise _BatchAborted(result)
+            return result
 
-            elif name == "search_memories_agentic":
-                args = SearchArgs(**arguments)
-                results = memory_system.search_agentic(args.query, k=args.k)
+        tasks = [asyncio.create_task(_run(op)) for op in args.operations]
+        try:
+            results = await asyncio.gather(*tasks)
+        except _BatchAborted as aborted:
+            # Cancel whatever has not finished; report completed work and the failure
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            results = []
+            for task in tasks:
+                if task.cancelled():
+                    results.append({"status": "cancelled"})
+                elif isinstance(task.exception(), _BatchAborted):
+                    results.append(task.exception().result)
+                else:
+                    results.append(task.result())
+            return {
+                "status": "error",
+                "message": f"Batch stopped on error: {aborted.result.get('message', '')}",
+                "count": len(results),
+                "results": results
+            }
 
-                result = {
-                    "status": "success",
-                    "count": len(results),
-                    "results": results
-                }
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
-
-            elif name == "search_memories_by_time":
-                args = SearchByTimeArgs(**arguments)
-
-                # Require at least one time constraint
-                if not args.time_from and not args.time_to:
-                    result = {
-                        "status": "error",
-                        "message": "Must provide at least one of time_from or time_to"
-                    }
-                    return [TextContent(type="text", text=json.dumps(result, indent=2))]
-
-                # Execute search
-                results = memory_system.search_by_time(
-                    time_from=args.time_from,
-                    time_to=args.time_to,
-                    query=args.query,
-                    k=args.k
-                )
+        return {
+            "status": "success",
+            "count": len(results),
+            "results": results
+        }
 
-                result = {
-                    "status": "success",
-                    "count": len(results),
-                    "time_range": {
-                        "from": args.time_from,
-                        "to": args.time_to
-                    },
-                    "results": results
-                }
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    handlers["batch_execute"] = _do_batch_execute
 
-            elif name == "check_task_status":
-                args = CheckTaskStatusArgs(**arguments)
-                task = await task_tracker.get_task(args.task_id)
+    @server.call_tool()
+    async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+        """Handle tool calls.
 
-                if task is None:
-                    result = {
-                        "status": "error",
-                        "message": f"Task not found: {args.task_id} (may have expired)"
-                    }
-                else:
-                    result = {
-                        "status": task.status,
-                        "task_id": task.task_id,
-                        "created_at": task.created_at.isoformat(),
-                        "updated_at": task.updated_at.isoformat()
-                    }
-                    if task.memory_id:
-                        result["memory_id"] = task.memory_id
-                    if task.error:
-                        result["error"] = task.error
-
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        Args:
+            name: Name of the tool to call
+            arguments: Tool arguments
 
+        Returns:
+            List of TextContent responses
+        """
+        try:
+            handler = handlers.get(name)
+            if handler is None:
+                result = _unknown_tool(name)
             else:
-                result = {
-                    "status": "error",
-                    "message": f"Unknown tool: {name}"
-                }
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
+                if ensure_initialized is not None:
+                    await ensure_initialized()
+                result = await handler(arguments)
+            return _respond(result)
 
         except Exception as e:
             result = {
                 "status": "error",
                 "message": f"Tool execution error: {str(e)}"
             }
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return _respond(result)
@@ -6,15 +6,26 @@ Usage:
     python debug_retrieval.py "your query here"
     python debug_retrieval.py "your query here" --mode agentic
     python debug_retrieval.py "your query here" -k 10 --output results.json
+    python debug_retrieval.py --queries-file queries.txt
 """
 
 import argparse
 import json
 import sys
 import time
-from typing import Dict, Any, List
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+import numpy as np
+
+# orjson writes the --output report much faster; the stdlib encoder is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Color codes for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -27,41 +38,97 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
-def print_header(text: str):
+
+class _NoColors:
+    """Blank color codes used with --no-color."""
+    HEADER = BLUE = CYAN = GREEN = YELLOW = RED = ENDC = BOLD = UNDERLINE = ''
+
+
+# Escape codes only help a terminal; leave them out when output is piped or redirected
+if not sys.stdout.isatty():
+    Colors = _NoColors
+
+def truncate(text: str, limit: int, suffix: str = "...") -> str:
+    """Return text unchanged if short enough, else its first limit characters plus suffix."""
+    return text if len(text) <= limit else f"{text[:limit]}{suffix}"
+
+def emit(text: str = "", buf: Optional[List[str]] = None):
+    """Print a line, or append it to buf for a later single write."""
+    if buf is None:
+        print(text)
+    else:
+        buf.append(text + "\n")
+
+def flush(buf: List[str]):
+    """Write all buffered lines with one stdout write and empty the buffer."""
+    if buf:
+        sys.stdout.write("".join(buf))
+        sys.stdout.flush()
+        buf.clear()
+
+def print_header(text: str, buf: Optional[List[str]] = None):
     """Print a formatted section header."""
-    print(f"\n{Colors.BOLD}{Colors.HEADER}{'='*80}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.HEADER}{text}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.HEADER}{'='*80}{Colors.ENDC}\n")
+    emit(f"\n{Colors.BOLD}{Colors.HEADER}{'='*80}{Colors.ENDC}", buf)
+    emit(f"{Colors.BOLD}{Colors.HEADER}{text}{Colors.ENDC}", buf)
+    emit(f"{Colors.BOLD}{Colors.HEADER}{'='*80}{Colors.ENDC}\n", buf)
 
-def print_subheader(text: str):
+def print_subheader(text: str, buf: Optional[List[str]] = None):
     """Print a formatted subsection header."""
-    print(f"\n{Colors.BOLD}{Colors.CYAN}{text}{Colors.ENDC}")
-    print(f"{Colors.CYAN}{'-'*60}{Colors.ENDC}")
+    emit(f"\n{Colors.BOLD}{Colors.CYAN}{text}{Colors.ENDC}", buf)
+    emit(f"{Colors.CYAN}{'-'*60}{Colors.ENDC}", buf)
 
-def print_step(step_num: int, step_name: str):
+def print_step(step_num: int, step_name: str, buf: Optional[List[str]] = None):
     """Print a step indicator."""
-    print(f"\n{Colors.BOLD}{Colors.BLUE}[STEP {step_num}] {step_name}{Colors.ENDC}")
+    emit(f"\n{Colors.BOLD}{Colors.BLUE}[STEP {step_num}] {step_name}{Colors.ENDC}", buf)
 
-def print_key_value(key: str, value: Any, indent: int = 0):
-    """Print a key-value pair with formatting."""
+def format_key_value(key: str, value: Any, indent: int = 0) -> str:
+    """Format a key-value pair (without trailing newline)."""
     indent_str = "  " * indent
+    if (isinstance(value, list) and len(value) < 50
+            and all(v is None or isinstance(v, (str, int, float)) for v in value)):
+        # Short flat lists (keywords, tags, links) fit on one line; without indent
+        # json.dumps also takes the C encoder instead of the pure-Python one
+        return f"{indent_str}{Colors.GREEN}{key}:{Colors.ENDC}\n{indent_str}  {json.dumps(value)}"
     if isinstance(value, (list, dict)):
-        print(f"{indent_str}{Colors.GREEN}{key}:{Colors.ENDC}")
-        print(f"{indent_str}  {json.dumps(value, indent=2)}")
-    else:
-        print(f"{indent_str}{Colors.GREEN}{key}:{Colors.ENDC} {value}")
+        return f"{indent_str}{Colors.GREEN}{key}:{Colors.ENDC}\n{indent_str}  {json.dumps(value, indent=2)}"
+    return f"{indent_str}{Colors.GREEN}{key}:{Colors.ENDC} {value}"
+
+def print_key_value(key: str, value: Any, indent: int = 0, buf: Optional[List[str]] = None):
+    """Print a key-value pair with formatting."""
+    emit(format_key_value(key, value, indent), buf)
 
-def print_warning(text: str):
+def print_warning(text: str, buf: Optional[List[str]] = None):
     """Print a warning message."""
-    print(f"{Colors.YELLOW}⚠ WARNING: {text}{Colors.ENDC}")
+    emit(f"{Colors.YELLOW}⚠ WARNING: {text}{Colors.ENDC}", buf)
 
-def print_success(text: str):
+def print_success(text: str, buf: Optional[List[str]] = None):
     """Print a success message."""
-    print(f"{Colors.GREEN}✓ {text}{Colors.ENDC}")
+    emit(f"{Colors.GREEN}✓ {text}{Colors.ENDC}", buf)
 
-def print_error(text: str):
+def print_error(text: str, buf: Optional[List[str]] = None):
     """Print an error message."""
-    print(f"{Colors.RED}✗ ERROR: {text}{Colors.ENDC}")
+    emit(f"{Colors.RED}✗ ERROR: {text}{Colors.ENDC}", buf)
+
+
+# One formatted block per retrieved memory in STEP 6. Colors are filled in at
+# format time because --no-color blanks them after import.
+_RESULT_TEMPLATE = (
+    "\n  {bold}{green}Memory #{n}{endc}\n"
+    "{id}\n"
+    "{match}\n"
+    "{content}\n"
+    "{keywords}\n"
+    "{tags}\n"
+    "{context}\n"
+    "{retrieval_count}\n"
+    "{links}"
+)
+
+
+# Distance -> similarity as 1 - scale * distance, per Chroma hnsw:space. Chroma's
+# "l2" is squared euclidean, which is 2 - 2*cos for the unit-length embeddings
+# all-MiniLM-L6-v2 produces; "cosine" and "ip" distances are already 1 - cos.
+_SIMILARITY_SCALE = {"cosine": 1.0, "ip": 1.0, "l2": 0.5}
 
 
 class RetrievalDebugger:
@@ -70,8 +137,27 @@ class RetrievalDebugger:
     def __init__(self, memory_system):
         self.memory_system = memory_system
         self.debug_info = {}
+        # Collections created without hnsw:space use Chroma's default, l2
+        collection_metadata = memory_system.retriever.collection.metadata or {}
+        self.space = collection_metadata.get('hnsw:space', 'l2')
+
+    @contextmanager
+    def _time_step(self, step_num: int, name: str):
+        """Record a step in debug_info and time the enclosed block.
 
-    def debug_search(self, query: str, k: int = 5, mode: str = "basic") -> Dict[str, Any]:
+        Yields the step record so callers can add step-specific fields;
+        duration_ms is filled in when the block exits.
+        """
+        rec = {"step": step_num, "name": name, "duration_ms": 0.0}
+        self.debug_info['steps'].append(rec)
+        t0 = time.perf_counter_ns()
+        try:
+            yield rec
+        finally:
+            rec['duration_ms'] = (time.perf_counter_ns() - t0) / 1e6
+
+    def debug_search(self, query: str, k: int = 5, mode: str = "basic",
+                     raw_results: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Execute a search with full debugging information.
 
@@ -79,11 +165,13 @@ class RetrievalDebugger:
             query: Search query
             k: Number of results
             mode: "basic" or "agentic"
+            raw_results: This query's slice of a retriever.search_batch() call;
+                STEP 1 reuses it instead of querying ChromaDB
 
         Returns:
             Dictionary containing debug information and results
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         self.debug_info = {
             "query": {
                 "original": query,
@@ -93,62 +181,73 @@ class RetrievalDebugger:
             },
             "steps": []
         }
+        # Output is buffered and written once per step instead of one print() per line
+        buf: List[str] = []
 
-        print_header(f"DEBUGGING RETRIEVAL WORKFLOW")
-        print_key_value("Query", query)
-        print_key_value("Mode", mode)
-        print_key_value("Results requested (k)", k)
+        print_header(f"DEBUGGING RETRIEVAL WORKFLOW", buf=buf)
+        print_key_value("Query", query, buf=buf)
+        print_key_value("Mode", mode, buf=buf)
+        print_key_value("Results requested (k)", k, buf=buf)
 
-        # STEP 1: ChromaDB Query
-        print_step(1, "ChromaDB Vector Search")
-        step1_start = time.time()
+        flush(buf)
 
-        raw_results = self.memory_system.retriever.search(query, k)
+        # STEP 1: ChromaDB Query
+        print_step(1, "ChromaDB Vector Search", buf=buf)
+        batched = raw_results is not None
+        with self._time_step(1, "ChromaDB Vector Search") as step1:
+            if not batched:
+                raw_results = self.memory_system.retriever.search(query, k)
+        step1_time = step1['duration_ms']
+        step1['results_count'] = len(raw_results['ids'][0]) if raw_results['ids'] else 0
+        step1['batched'] = batched
+
+        print_key_value("Collection", self.memory_system.retriever.collection.name, buf=buf)
+        print_key_value("Embedding model", "all-MiniLM-L6-v2", buf=buf)
+        print_key_value("Distance space", self.space, buf=buf)
+        print_key_value("Query time", "shared batched query (see batch summary)" if batched else f"{step1_time:.2f}ms", buf=buf)
+        print_key_value("Results found", step1['results_count'], buf=buf)
+
+        flush(buf)
 
-        step1_time = (time.time() - step1_start) * 1000
+        # STEP 2: Display Raw ChromaDB Results
+        print_step(2, "Raw ChromaDB Results", buf=buf)
 
-        print_key_value("Collection", self.memory_system.retriever.collection.name)
-        print_key_value("Embedding model", "all-MiniLM-L6-v2")
-        print_key_value("Query time", f"{step1_time:.2f}ms")
-        print_key_value("Results found", len(raw_results['ids'][0]) if raw_results['ids'] else 0)
+        if step1['results_count'] > 0:
+            print_subheader("Top Results with Similarity Scores", buf=buf)
 
-        self.debug_info['steps'].append({
-            "step": 1,
-            "name": "ChromaDB Vector Search",
-            "duration_ms": step1_time,
-            "results_count": len(raw_results['ids'][0]) if raw_results['ids'] else 0
-        })
+            # Bind the result columns once; optional ones are present for every row or absent
+            ids = raw_results['ids'][0]
+            distances = raw_results['distances'][0]
+            documents = raw_results['documents'][0] if raw_results.get('documents') else None
+            metadatas = raw_results['metadatas'][0] if raw_results.get('metadatas') else None
 
-        # STEP 2: Display Raw ChromaDB Results
-        print_step(2, "Raw ChromaDB Results")
-
-        if raw_results['ids'] and len(raw_results['ids'][0]) > 0:
-            print_subheader("Top Results with Similarity Scores")
+            # Convert all distances to similarities at once (back to Python floats for JSON output)
+            scale = _SIMILARITY_SCALE.get(self.space, 1.0)
+            similarities = (1.0 - scale * np.asarray(distances, dtype=np.float64)).tolist()
 
+            # Color codes are fixed for the run; bind them once for the loop
+            BOLD, GREEN, ENDC = Colors.BOLD, Colors.GREEN, Colors.ENDC
             raw_data = []
-            for i, doc_id in enumerate(raw_results['ids'][0]):
-                distance = raw_results['distances'][0][i]
-                similarity = 1 - distance  # Convert distance to similarity
-                document = raw_results['documents'][0][i] if raw_results.get('documents') else None
-                metadata = raw_results['metadatas'][0][i] if raw_results.get('metadatas') else {}
+            for i, doc_id in enumerate(ids):
+                distance = distances[i]
+                similarity = similarities[i]
+                document = documents[i] if documents is not None else None
+                metadata = metadatas[i] if metadatas is not None else {}
 
-                print(f"\n  {Colors.BOLD}Result #{i+1}{Colors.ENDC}")
-                print_key_value("ID", doc_id, indent=1)
-                print_key_value("Distance", f"{distance:.4f}", indent=1)
-                print_key_value("Similarity", f"{similarity:.4f}", indent=1)
+                emit(f"\n  {BOLD}Result #{i+1}{ENDC}", buf)
+                print_key_value("ID", doc_id, indent=1, buf=buf)
+                print_key_value("Distance", f"{distance:.4f}", indent=1, buf=buf)
+                print_key_value("Similarity", f"{similarity:.4f}", indent=1, buf=buf)
 
                 if document:
                     # Show enhanced document (what was actually embedded)
-                    print_key_value("Enhanced document", document[:200] + "..." if len(document) > 200 else document, indent=1)
+                    print_key_value("Enhanced document", truncate(document, 200), indent=1, buf=buf)
 
                 # Show raw metadata (still as JSON strings)
                 if metadata:
-                    print(f"  {Colors.GREEN}Raw metadata (pre-deserialization):{Colors.ENDC}")
+                    emit(f"  {GREEN}Raw metadata (pre-deserialization):{ENDC}", buf)
                     for key, value in metadata.items():
-                        if isinstance(value, str) and len(value) > 100:
-                            print(f"    {key}: {value[:100]}...")
-                        else:
-                            print(f"    {key}: {value}")
+                        emit(f"    {key}: {truncate(value, 100) if isinstance(value, str) else value}", buf)
 
                 raw_data.append({
                     "id": doc_id,
@@ -160,123 +259,128 @@ class RetrievalDebugger:
 
             self.debug_info['raw_chromadb_results'] = raw_data
         else:
-            print_warning("No results found from ChromaDB")
+            print_warning("No results found from ChromaDB", buf=buf)
+
+        flush(buf)
 
         # STEP 3: Metadata Processing
-        print_step(3, "Metadata Deserialization")
-        step3_start = time.time()
-
-        # The retriever.search() already deserializes metadata
-        print_success("Metadata automatically deserialized by retriever")
-        print_key_value("Conversions performed", {
-            "keywords": "JSON string → list",
-            "tags": "JSON string → list",
-            "links": "JSON string → list",
-            "retrieval_count": "string → int"
-        })
-
-        step3_time = (time.time() - step3_start) * 1000
-        self.debug_info['steps'].append({
-            "step": 3,
-            "name": "Metadata Deserialization",
-            "duration_ms": step3_time
-        })
+        print_step(3, "Metadata Deserialization", buf=buf)
+        with self._time_step(3, "Metadata Deserialization"):
+            # The retriever.search() already deserializes metadata
+            print_success("Metadata automatically deserialized by retriever", buf=buf)
+            print_key_value("Conversions performed", {
+                "keywords": "JSON string → list",
+                "tags": "JSON string → list",
+                "links": "JSON string → list",
+                "retrieval_count": "string → int"
+            }, buf=buf)
+
+        flush(buf)
 
         # STEP 4: Memory System Processing
-        print_step(4, "Memory System Processing")
-        step4_start = time.time()
-
-        if mode == "basic":
-            results = self.memory_system.search(query, k)
-        else:
-            results = self.memory_system.search_agentic(query, k)
-
-        step4_time = (time.time() - step4_start) * 1000
+        print_step(4, "Memory System Processing", buf=buf)
+        with self._time_step(4, "Memory System Processing") as step4:
+            # Reuse the STEP 1 vector search instead of querying ChromaDB again
+            if mode == "basic":
+                results = self.memory_system.search(query, k, raw_results=raw_results)
+            else:
+                results = self.memory_system.search_agentic(query, k, raw_results=raw_results)
+        step4_time = step4['duration_ms']
+        step4['method'] = mode
+        step4['final_count'] = len(results)
 
-        print_key_value("Search method", f"search_agentic()" if mode == "agentic" else "search()")
-        print_key_value("Processing time", f"{step4_time:.2f}ms")
-        print_key_value("Final results count", len(results))
+        print_key_value("Search method", f"search_agentic()" if mode == "agentic" else "search()", buf=buf)
+        print_key_value("Processing time", f"{step4_time:.2f}ms", buf=buf)
+        print_key_value("Final results count", len(results), buf=buf)
 
-        self.debug_info['steps'].append({
-            "step": 4,
-            "name": "Memory System Processing",
-            "duration_ms": step4_time,
-            "method": mode,
-            "final_count": len(results)
-        })
+        flush(buf)
 
         # STEP 5: Agentic Expansion (if applicable)
         if mode == "agentic":
-            print_step(5, "Agentic Link Expansion")
+            print_step(5, "Agentic Link Expansion", buf=buf)
 
-            primary_results = [r for r in results if not r.get('is_neighbor', False)]
-            linked_results = [r for r in results if r.get('is_neighbor', False)]
+            # Partition in one pass
+            primary_results, linked_results = [], []
+            for r in results:
+                (linked_results if r.get('is_neighbor') else primary_results).append(r)
 
-            print_key_value("Primary results (from vector search)", len(primary_results))
-            print_key_value("Linked results (from graph traversal)", len(linked_results))
+            print_key_value("Primary results (from vector search)", len(primary_results), buf=buf)
+            print_key_value("Linked results (from graph traversal)", len(linked_results), buf=buf)
 
             if linked_results:
-                print_subheader("Link Expansion Details")
-                expansion_map = {}
+                print_subheader("Link Expansion Details", buf=buf)
+                expansion_map = defaultdict(list)
                 for result in linked_results:
-                    parent = result.get('parent_memory_id', 'unknown')
-                    if parent not in expansion_map:
-                        expansion_map[parent] = []
-                    expansion_map[parent].append(result['id'])
+                    expansion_map[result.get('parent_memory_id', 'unknown')].append(result['id'])
 
                 for parent_id, linked_ids in expansion_map.items():
-                    print(f"  {Colors.YELLOW}├─{Colors.ENDC} {parent_id} → {linked_ids}")
+                    emit(f"  {Colors.YELLOW}├─{Colors.ENDC} {parent_id} → {linked_ids}", buf)
 
                 self.debug_info['agentic_expansion'] = {
                     "primary_count": len(primary_results),
                     "linked_count": len(linked_results),
-                    "expansion_map": expansion_map
+                    "expansion_map": dict(expansion_map)
                 }
 
+        flush(buf)
+
         # STEP 6: Final Results
-        print_step(6, "Final Results")
+        print_step(6, "Final Results", buf=buf)
 
-        print_subheader("Retrieved Memories")
+        print_subheader("Retrieved Memories", buf=buf)
 
+        # Loop invariants: the color codes and the linked-memory marker
+        colors = {"bold": Colors.BOLD, "green": Colors.GREEN, "endc": Colors.ENDC}
+        linked_match = f"  {Colors.YELLOW}  [LINKED MEMORY - via graph traversal]{Colors.ENDC}"
         for i, result in enumerate(results):
-            print(f"\n  {Colors.BOLD}{Colors.GREEN}Memory #{i+1}{Colors.ENDC}")
-            print_key_value("ID", result['id'], indent=1)
-
             if result.get('is_neighbor'):
-                print(f"  {Colors.YELLOW}  [LINKED MEMORY - via graph traversal]{Colors.ENDC}")
+                match = linked_match
             else:
-                print_key_value("Similarity Score", f"{result.get('score', 'N/A'):.4f}" if result.get('score') else 'N/A', indent=1)
-
-            print_key_value("Content", result['content'][:150] + "..." if len(result['content']) > 150 else result['content'], indent=1)
-            print_key_value("Keywords", result.get('keywords', []), indent=1)
-            print_key_value("Tags", result.get('tags', []), indent=1)
-            print_key_value("Context", result.get('context', 'N/A'), indent=1)
-            print_key_value("Retrieval Count", result.get('retrieval_count', 0), indent=1)
-
-            if result.get('links'):
-                print_key_value("Links to", result['links'], indent=1)
+                score = result.get('score')
+                match = format_key_value("Similarity Score", f"{score:.4f}" if score else 'N/A', indent=1)
+            content = result.get('content', '')
+            links = result.get('links')
+
+            buf.append(_RESULT_TEMPLATE.format_map({
+                **colors,
+                "n": i + 1,
+                "id": format_key_value("ID", result['id'], indent=1),
+                "match": match,
+                "content": format_key_value("Content", truncate(content, 150), indent=1),
+                "keywords": format_key_value("Keywords", result.get('keywords', []), indent=1),
+                "tags": format_key_value("Tags", result.get('tags', []), indent=1),
+                "context": format_key_value("Context", result.get('context', 'N/A'), indent=1),
+                "retrieval_count": format_key_value("Retrieval Count", result.get('retrieval_count', 0), indent=1),
+                "links": format_key_value("Links to", links, indent=1) + "\n" if links else ""
+            }))
+
+        flush(buf)
 
         # Performance Summary
-        total_time = (time.time() - start_time) * 1000
+        total_time = (time.perf_counter_ns() - start_ns) / 1e6
+        # count() hits SQLite; read it once for both the printout and debug_info
+        collection_size = self.memory_system.retriever.collection.count()
+        cache_size = len(self.memory_system.cache.cache)
 
-        print_header("PERFORMANCE SUMMARY")
-        print_key_value("Total execution time", f"{total_time:.2f}ms")
-        print_key_value("ChromaDB collection size", self.memory_system.retriever.collection.count())
-        print_key_value("LRU cache size", len(self.memory_system.cache.cache))
+        print_header("PERFORMANCE SUMMARY", buf=buf)
+        print_key_value("Total execution time", f"{total_time:.2f}ms", buf=buf)
+        print_key_value("ChromaDB collection size", collection_size, buf=buf)
+        print_key_value("LRU cache size", cache_size, buf=buf)
 
-        print_subheader("Step Timing Breakdown")
+        print_subheader("Step Timing Breakdown", buf=buf)
         for step in self.debug_info['steps']:
             percentage = (step['duration_ms'] / total_time * 100) if total_time > 0 else 0
-            print(f"  Step {step['step']}: {step['name']:<30} {step['duration_ms']:>8.2f}ms ({percentage:>5.1f}%)")
+            emit(f"  Step {step['step']}: {step['name']:<30} {step['duration_ms']:>8.2f}ms ({percentage:>5.1f}%)", buf)
 
         self.debug_info['performance'] = {
             "total_duration_ms": total_time,
-            "collection_size": self.memory_system.retriever.collection.count(),
-            "cache_size": len(self.memory_system.cache.cache)
+            "collection_size": collection_size,
+            "cache_size": cache_size
         }
 
         self.debug_info['final_results'] = results
 
+        flush(buf)
         return self.debug_info
 
 
@@ -289,15 +393,23 @@ Examples:
   python debug_retrieval.py "how does memory evolution work"
   python debug_retrieval.py "authentication flow" --mode agentic
   python debug_retrieval.py "database queries" -k 10 --output debug.json
+  python debug_retrieval.py --queries-file queries.txt --mode agentic
         """
     )
 
     parser.add_argument(
         "query",
         type=str,
+        nargs="?",
         help="The search query to debug"
     )
 
+    parser.add_argument(
+        "--queries-file",
+        type=str,
+        help="File with one query per line; all queries share one batched ChromaDB search"
+    )
+
     parser.add_argument(
         "-k",
         type=int,
@@ -322,16 +434,22 @@ Examples:
     parser.add_argument(
         "--no-color",
         action="store_true",
-        help="Disable colored output"
+        help="Disable colored output (automatic when stdout is not a terminal)"
     )
 
     args = parser.parse_args()
 
+    queries = [args.query] if args.query else []
+    if args.queries_file:
+        with open(args.queries_file) as f:
+            queries.extend(line.strip() for line in f if line.strip())
+    if not queries:
+        parser.error("provide a query or --queries-file")
+
     # Disable colors if requested
     if args.no_color:
-        for attr in dir(Colors):
-            if not attr.startswith('_'):
-                setattr(Colors, attr, '')
+        global Colors
+        Colors = _NoColors
 
     try:
         # Import and initialize memory system
@@ -351,12 +469,42 @@ Examples:
 
         # Create debugger and run search
         debugger = RetrievalDebugger(memory_system)
-        debug_info = debugger.debug_search(args.query, args.k, args.mode)
+        if len(queries) == 1:
+            debug_info = debugger.debug_search(queries[0], args.k, args.mode)
+        else:
+            # One embedding pass and one ChromaDB query for the whole sweep
+            batch_start = time.perf_counter_ns()
+            batch_results = memory_system.retriever.search_batch(queries, args.k)
+            batch_time = (time.perf_counter_ns() - batch_start) / 1e6
+
+            print_header("BATCHED VECTOR SEARCH")
+            print_key_value("Queries", len(queries))
+            print_key_value("Batched query time", f"{batch_time:.2f}ms")
+            print_key_value("Per query", f"{batch_time / len(queries):.2f}ms")
+
+            debug_info = {
+                "batch": {
+                    "query_count": len(queries),
+                    "duration_ms": batch_time
+                },
+                "queries": [
+                    debugger.debug_search(query, args.k, args.mode, raw_results=raw_results)
+                    for query, raw_results in zip(queries, batch_results)
+                ]
+            }
 
         # Save to file if requested
         if args.output:
-            with open(args.output, 'w') as f:
-                json.dump(debug_info, f, indent=2, default=str)
+            if orjson is not None:
+                with open(args.output, 'wb') as f:
+                    f.write(orjson.dumps(
+                        debug_info,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                        default=str
+                    ))
+            else:
+                with open(args.output, 'w') as f:
+                    json.dump(debug_info, f, indent=2, default=str)
             print_success(f"Debug information saved to {args.output}")
 
         print(f"\n{Colors.BOLD}{Colors.GREEN}Debug session completed successfully!{Colors.ENDC}\n")
@@ -1,54 +1,68 @@
 #!/usr/bin/env python3
 """Script to inspect stored memories in the ChromaDB database."""
 
-import chromadb
-from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
-import json
+from agentic_memory._singletons import get_client, get_embedder
+from agentic_memory_mcp.serialization import loads
+
+# Documents fetched per collection.get() call
+PAGE_SIZE = 500
+
+def _parse_list(value):
+    """Decode a list field that ChromaDB may hand back JSON-serialized."""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str) and value.startswith('['):
+        return loads(value)
+    return []
 
 def inspect_memories():
     # Connect to existing ChromaDB
-    client = chromadb.PersistentClient(path="./chroma_db")
-    embedding_function = SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2")
+    client = get_client("./chroma_db")
+    embedding_function = get_embedder("all-MiniLM-L6-v2")
 
     try:
         collection = client.get_collection(name="memories", embedding_function=embedding_function)
 
-        # Get all documents
-        results = collection.get()
-
         print(f"{'='*80}")
-        print(f"TOTAL MEMORIES: {len(results['ids'])}")
+        print(f"TOTAL MEMORIES: {collection.count()}")
         print(f"{'='*80}\n")
 
-        # Display each memory
-        for i, doc_id in enumerate(results['ids'], 1):
-            metadata = results['metadatas'][i-1]
-
-            print(f"Memory #{i}")
-            print(f"ID: {doc_id}")
-            print(f"Content: {metadata.get('content', 'N/A')[:200]}...")
-
-            # Parse JSON fields
-            keywords = metadata.get('keywords', '[]')
-            if isinstance(keywords, str):
-                keywords = json.loads(keywords) if keywords.startswith('[') else []
-            print(f"Keywords: {keywords}")
-
-            tags = metadata.get('tags', '[]')
-            if isinstance(tags, str):
-                tags = json.loads(tags) if tags.startswith('[') else []
-            print(f"Tags: {tags}")
+        # Page through documents; metadata carries every displayed field
+        offset = 0
+        while True:
+            results = collection.get(limit=PAGE_SIZE, offset=offset, include=["metadatas"])
+            if not results['ids']:
+                break
 
-            print(f"Context: {metadata.get('context', 'N/A')[:150]}")
+            # Pull each displayed field out as a column for the whole page
+            metas = results['metadatas']
+            contents = [m.get('content', 'N/A')[:200] for m in metas]
+            keywords = [_parse_list(m.get('keywords')) for m in metas]
+            tags = [_parse_list(m.get('tags')) for m in metas]
+            contexts = [m.get('context', 'N/A')[:150] for m in metas]
+            link_counts = [len(_parse_list(m.get('links'))) for m in metas]
+            timestamps = [m.get('timestamp', 'N/A') for m in metas]
+            retrieval_counts = [m.get('retrieval_count', 'N/A') for m in metas]
 
-            links = metadata.get('links', '[]')
-            if isinstance(links, str):
-                links = json.loads(links) if links.startswith('[') else []
-            print(f"Links: {len(links)} connections")
+            # Display each memory, one row of the columns at a time
+            lines = []
+            for j, doc_id in enumerate(results['ids']):
+                lines.append(
+                    f"Memory #{offset + j + 1}\n"
+                    f"ID: {doc_id}\n"
+                    f"Content: {contents[j]}...\n"
+                    f"Keywords: {keywords[j]}\n"
+                    f"Tags: {tags[j]}\n"
+                    f"Context: {contexts[j]}\n"
+                    f"Links: {link_counts[j]} connections\n"
+                    f"Timestamp: {timestamps[j]}\n"
+                    f"Retrieval Count: {retrieval_counts[j]}\n"
+                    f"{'-'*80}\n"
+                )
+            # One write per page instead of nine print() calls per memory
+            print("\n".join(lines))
 
-            print(f"Timestamp: {metadata.get('timestamp', 'N/A')}")
-            print(f"Retrieval Count: {metadata.get('retrieval_count', 'N/A')}")
-            print(f"{'-'*80}\n")
+            offset += PAGE_SIZE
 
     except Exception as e:
         print(f"Error: {e}")
@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 """Test direct ChromaDB access without AgenticMemorySystem."""
 
-from agentic_memory.retrievers import ChromaRetriever
+from agentic_memory._singletons import get_retriever
 
 # Connect directly to existing ChromaDB
-retriever = ChromaRetriever(collection_name="memories", model_name="all-MiniLM-L6-v2", persist_directory="./chroma_db")
+retriever = get_retriever(collection_name="memories", model_name="all-MiniLM-L6-v2", persist_directory="./chroma_db")
 
 print("Testing direct ChromaDB search...")
 print("="*80)
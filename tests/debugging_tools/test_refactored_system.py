@@ -5,8 +5,32 @@ import os
 os.environ['OPENAI_API_KEY'] = os.getenv('OPENAI_API_KEY', 'test-key')
 
 from agentic_memory.memory_system import AgenticMemorySystem
+import json
+import subprocess
+import sys
 import time
 
+
+def read_in_fresh_process(memory_id=None):
+    """Reopen ./chroma_db in a new interpreter (a real restart).
+
+    Returns the collection count and, if memory_id is given, that memory's tags.
+    Only chromadb is imported there, so no embedding model is loaded.
+    """
+    code = (
+        "import chromadb, json, sys\n"
+        "collection = chromadb.PersistentClient(path='./chroma_db').get_collection('memories')\n"
+        "tags = None\n"
+        "if sys.argv[1]:\n"
+        "    metadatas = collection.get(ids=[sys.argv[1]], include=['metadatas'])['metadatas']\n"
+        "    tags = json.loads(metadatas[0]['tags']) if metadatas else None\n"
+        "print(json.dumps({'count': collection.count(), 'tags': tags}))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code, memory_id or ""],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
 print("="*80)
 print("Testing Refactored AgenticMemorySystem")
 print("="*80)
@@ -58,20 +82,11 @@ for i, result in enumerate(results, 1):
     print(f"  {i}. {result['content'][:80]}...")
 print(f"  Cache stats: {memory_system.cache.get_stats()}")
 
-# Test 4: Verify persistence across restarts (simulate by creating new instance)
+# Test 4: Verify persistence across restarts (reopen ChromaDB in a fresh process)
 print("\n[Test 4] Testing persistence across restarts...")
-print("Creating new system instance (simulates restart)...")
-memory_system2 = AgenticMemorySystem(
-    model_name='all-MiniLM-L6-v2',
-    llm_backend="openai",
-    llm_model="gpt-4o-mini",
-    storage_path="./chroma_db",
-    cache_size=10,
-    enable_cache=True
-)
-
+print("Reopening ChromaDB in a new process (simulates restart)...")
 count_before = memory_system.retriever.count()
-count_after = memory_system2.retriever.count()
+count_after = read_in_fresh_process()['count']
 print(f"✓ Memories before restart: {count_before}")
 print(f"✓ Memories after restart: {count_after}")
 assert count_before == count_after, "Memory count should match after restart"
@@ -84,29 +99,26 @@ if memory_ids:
 
     # Update memory
     print(f"Updating memory {test_id}...")
-    success = memory_system2.update(test_id, tags=["test-tag-updated", "persistence-test"])
+    success = memory_system.update(test_id, tags=["test-tag-updated", "persistence-test"])
     print(f"✓ Update successful: {success}")
 
-    # Create new instance to verify update persisted
-    memory_system3 = AgenticMemorySystem(
-        model_name='all-MiniLM-L6-v2',
-        llm_backend="openai",
-        llm_model="gpt-4o-mini",
-        storage_path="./chroma_db",
-        cache_size=10
-    )
-
-    # Read updated memory
-    updated_memory = memory_system3.read(test_id)
+    # Drop in-process caches so the read below comes from ChromaDB
+    memory_system.reset_cache()
+    updated_memory = memory_system.read(test_id)
     print(f"✓ Updated tags: {updated_memory.tags}")
     assert "test-tag-updated" in updated_memory.tags, "Update should persist to ChromaDB"
+
+    # And a fresh process sees the same tags on disk
+    fresh_tags = read_in_fresh_process(test_id)['tags']
+    print(f"✓ Tags after restart: {fresh_tags}")
+    assert "test-tag-updated" in fresh_tags, "Update should persist across restarts"
     print(f"✓ Update persistence verified!")
 else:
     print("⚠ No memories to update, skipping test")
 
 # Test 6: Cache statistics
 print("\n[Test 6] Cache Statistics...")
-stats = memory_system2.cache.get_stats()
+stats = memory_system.cache.get_stats()
 print(f"  Cache size: {stats['size']}/{stats['max_size']}")
 print(f"  Hits: {stats['hits']}")
 print(f"  Misses: {stats['misses']}")
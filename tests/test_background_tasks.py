@@ -3,7 +3,7 @@
 import asyncio
 import pytest
 from datetime import datetime, timedelta, UTC
-from agentic_memory_mcp.background import TaskTracker, process_memory_task, MemoryTask
+from agentic_memory_mcp.background import TaskTracker, process_memory_task, process_memory_batch_task, MemoryTask, MetadataBatcher
 from agentic_memory.memory_system import AgenticMemorySystem
 
 
@@ -226,5 +226,51 @@ async def test_concurrent_task_operations():
     assert stats_size == 50
 
 
+@pytest.mark.asyncio
+async def test_metadata_batcher_coalesces_requests():
+    """Test concurrent analyze() calls are served by one batched call."""
+    class FakeMemorySystem:
+        def __init__(self):
+            self.calls = []
+
+        def analyze_contents(self, contents):
+            self.calls.append(list(contents))
+            return [{"keywords": [c], "context": c, "tags": ["t"]} for c in contents]
+
+    memory_system = FakeMemorySystem()
+    batcher = MetadataBatcher(memory_system, max_batch=8, max_wait_ms=50)
+
+    results = await asyncio.gather(*[batcher.analyze(f"note {i}") for i in range(5)])
+
+    assert len(memory_system.calls) == 1
+    assert memory_system.calls[0] == [f"note {i}" for i in range(5)]
+    assert [r["context"] for r in results] == [f"note {i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_process_memory_batch_task_completes_all_tasks():
+    """Test a batch task stores every note in one call and completes each task."""
+    class FakeMemorySystem:
+        def __init__(self):
+            self.calls = []
+
+        async def add_notes_async(self, notes):
+            self.calls.append(notes)
+            return [f"mem-{i}" for i in range(len(notes))]
+
+    from agentic_memory_mcp.background import task_tracker
+    notes = [{"content": f"batch note {i}"} for i in range(3)]
+    task_ids = [await task_tracker.create_task(note["content"]) for note in notes]
+
+    memory_system = FakeMemorySystem()
+    await process_memory_batch_task(memory_system, task_ids, notes)
+
+    assert memory_system.calls == [notes]
+    for i, task_id in enumerate(task_ids):
+        task = await task_tracker.get_task(task_id)
+        assert task.status == "completed"
+        assert task.memory_id == f"mem-{i}"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,10 +1,13 @@
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, AsyncMock, patch, MagicMock
 import json
 from agentic_memory.llm_controller import (
+    TokenBucket,
+    LLMCache,
     LLMController,
     OpenAIController,
     OllamaController,
+    SemanticLLMCache,
     SGLangController
 )
 
@@ -27,6 +30,48 @@ class TestSGLangController(unittest.TestCase):
         self.assertEqual(self.controller.sglang_port, 30000)
         self.assertEqual(self.controller.base_url, "http://localhost:30000")
 
+    def test_session_uses_pooled_adapter(self):
+        """Test that a keep-alive session with retries is mounted on the server URL"""
+        adapter = self.controller.session.get_adapter("http://localhost:30000/generate")
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertIn(429, adapter.max_retries.status_forcelist)
+        self.assertEqual(self.controller.session.headers["Connection"], "keep-alive")
+
+    def test_session_shared_across_controllers(self):
+        """Test that controllers for the same server reuse one session"""
+        other = SGLangController(model="other-model", sglang_host="http://localhost", sglang_port=30000)
+        self.assertIs(other.session, self.controller.session)
+        elsewhere = SGLangController(model="llama2", sglang_host="http://localhost", sglang_port=30001)
+        self.assertIsNot(elsewhere.session, self.controller.session)
+
+    def test_async_session_closed_with_its_loop(self):
+        """Test that a new event loop gets a new async session and the old one is closed"""
+        import asyncio
+
+        async def open_session():
+            return self.controller._get_aio_session()
+
+        first = asyncio.run(open_session())
+        self.assertTrue(first.closed)
+        second = asyncio.run(open_session())
+        self.assertIsNot(second, first)
+        self.assertTrue(second.closed)
+
+    def test_aclose_closes_async_session(self):
+        """Test that aclose() closes the session and a later call opens a fresh one"""
+        import asyncio
+
+        async def open_and_close():
+            session = self.controller._get_aio_session()
+            await self.controller.aclose()
+            self.assertTrue(session.closed)
+            self.assertIsNone(self.controller._aio_session)
+            reopened = self.controller._get_aio_session()
+            self.assertIsNot(reopened, session)
+            await self.controller.aclose()
+
+        asyncio.run(open_and_close())
+
     def test_generate_empty_value(self):
         """Test _generate_empty_value helper method"""
         self.assertEqual(self.controller._generate_empty_value("array"), [])
@@ -56,7 +101,18 @@ class TestSGLangController(unittest.TestCase):
         self.assertEqual(result["context"], "")
         self.assertEqual(result["tags"], [])
 
-    @patch('agentic_memory.llm_controller.requests.post')
+    def test_empty_json_is_cached_per_schema(self):
+        """Test that the serialized empty response is built once per response_format"""
+        response_format = {"json_schema": {"schema": {"properties": {"tags": {"type": "array"}}}}}
+        with patch.object(self.controller, '_generate_empty_response',
+                          wraps=self.controller._generate_empty_response) as mock_build:
+            first = self.controller._empty_json(response_format)
+            second = self.controller._empty_json(response_format)
+        self.assertEqual(json.loads(first), {"tags": []})
+        self.assertIs(first, second)
+        mock_build.assert_called_once()
+
+    @patch('agentic_memory.llm_controller.requests.Session.post')
     def test_get_completion_success(self, mock_post):
         """Test successful completion from SGLang server"""
         # Mock successful response
@@ -101,7 +157,7 @@ class TestSGLangController(unittest.TestCase):
         # Check result
         self.assertIsNotNone(result)
 
-    @patch('agentic_memory.llm_controller.requests.post')
+    @patch('agentic_memory.llm_controller.requests.Session.post')
     def test_get_completion_server_error(self, mock_post):
         """Test handling of SGLang server error"""
         # Mock error response
@@ -131,7 +187,7 @@ class TestSGLangController(unittest.TestCase):
         self.assertEqual(result_dict["keywords"], [])
         self.assertEqual(result_dict["context"], "")
 
-    @patch('agentic_memory.llm_controller.requests.post')
+    @patch('agentic_memory.llm_controller.requests.Session.post')
     def test_get_completion_network_error(self, mock_post):
         """Test handling of network error"""
         # Mock network error
@@ -156,6 +212,22 @@ class TestSGLangController(unittest.TestCase):
         result_dict = json.loads(result)
         self.assertEqual(result_dict["keywords"], [])
 
+    @patch('agentic_memory.llm_controller.requests.Session.post')
+    def test_malformed_json_retried_at_lower_temperature(self, mock_post):
+        """Test that an unparseable reply is retried once before falling back"""
+        bad, good = Mock(status_code=200), Mock(status_code=200)
+        bad.json.return_value = {"text": '{"keywords": ["trunc'}
+        good.json.return_value = {"text": '{"keywords": ["ok"]}'}
+        mock_post.side_effect = [bad, good]
+        response_format = {"json_schema": {"schema": {"properties": {"keywords": {"type": "array"}}}}}
+
+        result = self.controller.get_completion("Test prompt", response_format, temperature=0.7)
+
+        self.assertEqual(json.loads(result), {"keywords": ["ok"]})
+        self.assertEqual(mock_post.call_count, 2)
+        retry_payload = mock_post.call_args_list[1][1]['json']
+        self.assertEqual(retry_payload['sampling_params']['temperature'], self.controller.retry_temperature)
+
 
 class TestLLMControllerBackends(unittest.TestCase):
     """Test LLMController with different backends"""
@@ -212,7 +284,7 @@ class TestLLMControllerBackends(unittest.TestCase):
 class TestAgenticMemorySystemWithSGLang(unittest.TestCase):
     """Test AgenticMemorySystem with SGLang backend"""
 
-    @patch('agentic_memory.llm_controller.requests.post')
+    @patch('agentic_memory.llm_controller.requests.Session.post')
     def test_memory_system_with_sglang(self, mock_post):
         """Test creating AgenticMemorySystem with SGLang backend"""
         from agentic_memory.memory_system import AgenticMemorySystem
@@ -252,6 +324,63 @@ class TestAgenticMemorySystemWithSGLang(unittest.TestCase):
         self.assertEqual(memory_system.llm_controller.llm.sglang_port, 9999)
         self.assertEqual(memory_system.llm_controller.llm.base_url, "http://10.0.0.1:9999")
 
+    def test_repeated_analysis_is_served_from_cache(self):
+        """Test that analyze_content sends a cacheable temperature, so repeats skip the backend"""
+        from agentic_memory.memory_system import AgenticMemorySystem
+
+        memory_system = AgenticMemorySystem(llm_backend="sglang", llm_model="llama2")
+        memory_system.llm_controller.llm.get_completion = Mock(
+            return_value='{"keywords": ["cache"], "context": "Caching", "tags": ["test"]}'
+        )
+
+        first = memory_system.analyze_content("Repeated analysis content")
+        second = memory_system.analyze_content("Repeated analysis content")
+
+        self.assertEqual(first, second)
+        memory_system.llm_controller.llm.get_completion.assert_called_once()
+        _, _, temperature = memory_system.llm_controller.llm.get_completion.call_args.args
+        self.assertEqual(temperature, 0.0)
+
+    def _memory_system_with_semantic_cache(self, vectors):
+        """Memory system whose semantic cache embeds note content with fixed vectors."""
+        from agentic_memory.memory_system import AgenticMemorySystem
+
+        memory_system = AgenticMemorySystem(llm_backend="sglang", llm_model="llama2")
+        controller = memory_system.llm_controller
+        controller.semantic_cache = SemanticLLMCache(lambda texts: [vectors[t] for t in texts],
+                                                     threshold=controller.semantic_cache.threshold)
+        controller.llm.get_completion = Mock(
+            return_value='{"keywords": ["deploy"], "context": "Release schedule", "tags": ["ops"]}'
+        )
+        return memory_system
+
+    def test_reworded_note_hits_semantic_cache(self):
+        """Test that a near-verbatim repeat of a note reuses its analysis"""
+        memory_system = self._memory_system_with_semantic_cache({
+            "Deploys run on Fridays.": [1.0, 0.0, 0.0],
+            "deploys run on fridays": [0.999, 0.03, 0.0],
+        })
+
+        first = memory_system.analyze_content("Deploys run on Fridays.")
+        second = memory_system.analyze_content("deploys run on fridays")
+
+        self.assertEqual(first, second)
+        memory_system.llm_controller.llm.get_completion.assert_called_once()
+        self.assertEqual(memory_system.llm_controller.semantic_cache.stats["hits"], 1)
+
+    def test_different_note_misses_semantic_cache(self):
+        """Test that a related but distinct note gets its own analysis"""
+        memory_system = self._memory_system_with_semantic_cache({
+            "Deploys run on Fridays.": [1.0, 0.0, 0.0],
+            "Deploys run on Mondays.": [0.95, 0.31, 0.0],  # cosine ~0.95
+        })
+
+        memory_system.analyze_content("Deploys run on Fridays.")
+        memory_system.analyze_content("Deploys run on Mondays.")
+
+        self.assertEqual(memory_system.llm_controller.llm.get_completion.call_count, 2)
+        self.assertEqual(memory_system.llm_controller.semantic_cache.stats["hits"], 0)
+
 
 class TestSGLangJSONSchemaFormat(unittest.TestCase):
     """Test JSON schema formatting for SGLang"""
@@ -259,7 +388,7 @@ class TestSGLangJSONSchemaFormat(unittest.TestCase):
     def setUp(self):
         self.controller = SGLangController()
 
-    @patch('agentic_memory.llm_controller.requests.post')
+    @patch('agentic_memory.llm_controller.requests.Session.post')
     def test_json_schema_converted_to_string(self, mock_post):
         """Test that JSON schema is converted to string for SGLang"""
         mock_response = Mock()
@@ -293,5 +422,257 @@ class TestSGLangJSONSchemaFormat(unittest.TestCase):
         self.assertEqual(parsed_schema, schema)
 
 
+class TestLLMCache(unittest.TestCase):
+    """Test exact-match LLM response caching"""
+
+    def setUp(self):
+        self.controller = LLMController(backend="sglang", model="llama2")
+        self.controller.llm.get_completion = Mock(return_value='{"keywords": ["cached"]}')
+        self.response_format = {"json_schema": {"schema": {"properties": {"keywords": {"type": "array"}}}}}
+
+    def test_key_is_deterministic(self):
+        """Test that identical requests hash to the same key"""
+        key1 = LLMCache.make_key("m", "p", {"a": 1, "b": 2}, 0.0)
+        key2 = LLMCache.make_key("m", "p", {"b": 2, "a": 1}, 0.0)
+        self.assertEqual(key1, key2)
+        self.assertNotEqual(key1, LLMCache.make_key("m", "p", {"a": 1, "b": 2}, 0.5))
+
+    def test_deterministic_call_is_cached(self):
+        """Test that temperature=0 calls hit the backend only once"""
+        for _ in range(3):
+            result = self.controller.get_completion("prompt", self.response_format, temperature=0.0)
+        self.assertEqual(result, '{"keywords": ["cached"]}')
+        self.controller.llm.get_completion.assert_called_once()
+        self.assertEqual(self.controller.cache.stats["hits"], 2)
+        self.assertEqual(self.controller.cache.stats["misses"], 1)
+
+    def test_sampled_call_is_not_cached(self):
+        """Test that temperature>0 calls always reach the backend"""
+        self.controller.get_completion("prompt", self.response_format, temperature=1.0)
+        self.controller.get_completion("prompt", self.response_format, temperature=1.0)
+        self.assertEqual(self.controller.llm.get_completion.call_count, 2)
+
+    def test_empty_fallback_is_not_cached(self):
+        """Test that error fallbacks are not stored in the cache"""
+        self.controller.llm.get_completion.return_value = '{"keywords": []}'
+        self.controller.get_completion("prompt", self.response_format, temperature=0.0)
+        self.controller.get_completion("prompt", self.response_format, temperature=0.0)
+        self.assertEqual(self.controller.llm.get_completion.call_count, 2)
+
+    def test_lru_eviction(self):
+        """Test that the in-memory tier evicts least recently used entries"""
+        cache = LLMCache(max_size=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+
+    def test_sqlite_tier_persists(self):
+        """Test that the SQLite tier survives a new cache instance"""
+        import tempfile, os
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "llm_cache.sqlite")
+            LLMCache(db_path=path).set("key", "value")
+            self.assertEqual(LLMCache(db_path=path).get("key"), "value")
+
+
+class TestSemanticLLMCache(unittest.TestCase):
+    """Test embedding-similarity LLM response caching"""
+
+    def setUp(self):
+        vectors = {
+            "how does auth work": [1.0, 0.0, 0.0],
+            "how does authentication work": [0.99, 0.05, 0.0],
+            "database migrations": [0.0, 1.0, 0.0],
+        }
+        self.embedder = lambda texts: [vectors[t] for t in texts]
+        self.controller = LLMController(backend="sglang", model="llama2", embedder=self.embedder)
+        self.controller.llm.get_completion = Mock(return_value='{"keywords": ["auth"]}')
+        self.response_format = {"json_schema": {"schema": {"properties": {"keywords": {"type": "array"}}}}}
+
+    def test_paraphrase_hits_cache(self):
+        """Test that a semantically similar prompt reuses the cached response"""
+        self.controller.get_completion("how does auth work", self.response_format, temperature=0.1)
+        result = self.controller.get_completion("how does authentication work", self.response_format, temperature=0.1)
+        self.assertEqual(result, '{"keywords": ["auth"]}')
+        self.controller.llm.get_completion.assert_called_once()
+        self.assertEqual(self.controller.semantic_cache.stats["hits"], 1)
+
+    def test_dissimilar_prompt_misses(self):
+        """Test that an unrelated prompt reaches the backend"""
+        self.controller.get_completion("how does auth work", self.response_format, temperature=0.1)
+        self.controller.get_completion("database migrations", self.response_format, temperature=0.1)
+        self.assertEqual(self.controller.llm.get_completion.call_count, 2)
+
+    def test_schema_mismatch_misses(self):
+        """Test that a hit requires the same response_format"""
+        self.controller.get_completion("how does auth work", self.response_format, temperature=0.1)
+        self.controller.get_completion("how does authentication work", {"json_schema": {"schema": {}}}, temperature=0.1)
+        self.assertEqual(self.controller.llm.get_completion.call_count, 2)
+
+    def test_semantic_key_overrides_prompt(self):
+        """Test that semantic_key is embedded instead of the full prompt"""
+        cache = SemanticLLMCache(self.embedder)
+        cache.set(cache.embed("how does auth work"), None, "r")
+        self.controller.semantic_cache = cache
+        result = self.controller.get_completion("TEMPLATE ...", None, temperature=0.1,
+                                                semantic_key="how does authentication work")
+        self.assertEqual(result, "r")
+        self.controller.llm.get_completion.assert_not_called()
+
+    def test_opt_out_skips_semantic_layer(self):
+        """Test that use_semantic_cache=False neither reads nor fills the semantic cache"""
+        self.controller.get_completion("how does auth work", self.response_format, temperature=0.1)
+        self.controller.get_completion("how does authentication work", self.response_format, temperature=0.1,
+                                       use_semantic_cache=False)
+        self.assertEqual(self.controller.llm.get_completion.call_count, 2)
+        self.assertEqual(self.controller.semantic_cache.stats["size"], 1)
+
+
+class TestAsyncCompletion(unittest.IsolatedAsyncioTestCase):
+    """Test async completion paths"""
+
+    async def test_base_controller_falls_back_to_thread(self):
+        """Test that controllers without a native async client run get_completion in a thread"""
+        from tests.test_utils import MockLLMController
+        llm = MockLLMController()
+        llm.mock_response = '{"keywords": ["async"]}'
+        result = await llm.aget_completion("prompt", {}, 0.0)
+        self.assertEqual(result, '{"keywords": ["async"]}')
+
+    async def test_aget_completion_uses_cache(self):
+        """Test that LLMController.aget_completion shares the exact-match cache"""
+        controller = LLMController(backend="sglang", model="llama2")
+        controller.llm.aget_completion = AsyncMock(return_value='{"keywords": ["x"]}')
+        response_format = {"json_schema": {"schema": {"properties": {"keywords": {"type": "array"}}}}}
+
+        await controller.aget_completion("prompt", response_format, temperature=0.0)
+        result = await controller.aget_completion("prompt", response_format, temperature=0.0)
+
+        self.assertEqual(result, '{"keywords": ["x"]}')
+        controller.llm.aget_completion.assert_awaited_once()
+
+    async def test_concurrent_identical_calls_are_coalesced(self):
+        """Test that identical in-flight requests share one backend call"""
+        import asyncio
+        controller = LLMController(backend="sglang", model="llama2")
+        calls = 0
+
+        async def slow_completion(prompt, response_format, temperature):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return '{"tags": ["shared"]}'
+
+        controller.llm.aget_completion = slow_completion
+        results = await asyncio.gather(*[
+            controller.aget_completion("same prompt", {}, temperature=1.0) for _ in range(5)
+        ])
+
+        self.assertEqual(calls, 1)
+        self.assertEqual(set(results), {'{"tags": ["shared"]}'})
+
+    async def test_cancelled_leader_does_not_fail_followers(self):
+        """Test that cancelling the first caller leaves the shared call running for the others"""
+        import asyncio
+        controller = LLMController(backend="sglang", model="llama2")
+        calls = 0
+
+        async def slow_completion(prompt, response_format, temperature):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return '{"tags": ["shared"]}'
+
+        controller.llm.aget_completion = slow_completion
+        leader = asyncio.create_task(controller.aget_completion("same prompt", {}, temperature=1.0))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(controller.aget_completion("same prompt", {}, temperature=1.0))
+        await asyncio.sleep(0.01)
+
+        leader.cancel()
+        self.assertEqual(await follower, '{"tags": ["shared"]}')
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+        self.assertEqual(calls, 1)
+        self.assertEqual(controller._ainflight, {})
+
+
+class TestStreamingCompletion(unittest.TestCase):
+    """Test on_token streaming callbacks"""
+
+    @staticmethod
+    def _chunk(text):
+        return Mock(choices=[Mock(delta=Mock(content=text))])
+
+    def test_openai_streams_deltas(self):
+        """Test that OpenAIController forwards each delta and returns the joined text"""
+        with patch.object(OpenAIController, '__init__', return_value=None):
+            llm = OpenAIController()
+        llm.model = "gpt-4o-mini"
+        llm.client = Mock()
+        llm.client.chat.completions.create.return_value = iter(
+            [self._chunk('{"tags": '), self._chunk(None), self._chunk('["a"]}')]
+        )
+
+        tokens = []
+        result = llm.get_completion("prompt", {}, on_token=tokens.append)
+
+        self.assertEqual(result, '{"tags": ["a"]}')
+        self.assertEqual(tokens, ['{"tags": ', '["a"]}'])
+        self.assertTrue(llm.client.chat.completions.create.call_args.kwargs["stream"])
+
+    def test_non_streaming_backend_delivers_once(self):
+        """Test that backends without streaming hand the full response to on_token"""
+        controller = LLMController(backend="sglang", model="llama2")
+        controller.llm.get_completion = Mock(return_value='{"tags": []}')
+
+        tokens = []
+        result = controller.get_completion("prompt", {}, on_token=tokens.append)
+
+        self.assertEqual(result, '{"tags": []}')
+        self.assertEqual(tokens, ['{"tags": []}'])
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test client-side rate limiting"""
+
+    def test_burst_within_budget_does_not_wait(self):
+        """Test that requests within the per-minute budget are granted immediately"""
+        bucket = TokenBucket(rate_rpm=60, rate_tpm=10000)
+        for _ in range(5):
+            self.assertEqual(bucket._reserve(1000), 0.0)
+
+    def test_exhausted_bucket_reports_wait(self):
+        """Test that an exhausted bucket asks the caller to wait for refill"""
+        bucket = TokenBucket(rate_rpm=60)
+        for _ in range(60):
+            bucket._reserve(0)
+        wait = bucket._reserve(0)
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, 1.0)
+
+    def test_calibrate_from_provider_headers(self):
+        """Test that provider-reported remaining budget overrides the local estimate"""
+        bucket = TokenBucket(rate_rpm=100, rate_tpm=10000)
+        bucket.calibrate(remaining_requests=0, remaining_tokens=500)
+        self.assertGreater(bucket._reserve(100), 0)
+
+    def test_retry_on_rate_limit_error(self):
+        """Test that LLMController retries 429 errors and returns the eventual response"""
+        class RateLimited(Exception):
+            status_code = 429
+
+        controller = LLMController(backend="sglang", model="llama2")
+        controller.llm.get_completion = Mock(side_effect=[RateLimited(), '{"ok": true}'])
+        with patch('agentic_memory.llm_controller.time.sleep') as mock_sleep:
+            result = controller.get_completion("prompt", {}, temperature=1.0)
+        self.assertEqual(result, '{"ok": true}')
+        self.assertEqual(controller.llm.get_completion.call_count, 2)
+        mock_sleep.assert_called_once()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -269,5 +269,116 @@ class TestAgenticMemorySystem(unittest.TestCase):
         self.assertIsNotNone(processed_memory.context)
         self.assertIsNotNone(processed_memory.keywords)
 
+    def test_memory_summary_view(self):
+        """Test summary view and tag index track add/update/delete."""
+        long_content = "Summary view memory " + "x" * 300
+        memory_id = self.memory_system.add_note(long_content, tags=["summary-view-tag"])
+
+        summaries = {s["id"]: s for s in self.memory_system.get_memory_summaries()}
+        self.assertIn(memory_id, summaries)
+        self.assertTrue(summaries[memory_id]["content"].endswith("..."))
+        self.assertLess(len(summaries[memory_id]["content"]), len(long_content))
+
+        tagged = self.memory_system.get_memory_summaries_by_tag("summary-view-tag")
+        self.assertEqual([s["id"] for s in tagged], [memory_id])
+
+        # Pages slice the view in insertion order
+        total = self.memory_system.count_memory_summaries()
+        last_page = self.memory_system.get_memory_summaries(offset=total - 1, limit=10)
+        self.assertEqual([s["id"] for s in last_page], [memory_id])
+
+        # Retagging moves the memory between index entries
+        self.memory_system.update(memory_id, tags=["summary-view-retagged"])
+        self.assertEqual(self.memory_system.get_memory_summaries_by_tag("summary-view-tag"), [])
+        tagged = self.memory_system.get_memory_summaries_by_tag("summary-view-retagged")
+        self.assertEqual([s["id"] for s in tagged], [memory_id])
+        tag_counts = dict(self.memory_system.get_tag_counts())
+        self.assertNotIn("summary-view-tag", tag_counts)
+        self.assertEqual(tag_counts["summary-view-retagged"], 1)
+
+        # Deletion drops it from both the view and the index
+        self.memory_system.delete(memory_id)
+        ids = [s["id"] for s in self.memory_system.get_memory_summaries()]
+        self.assertNotIn(memory_id, ids)
+        self.assertEqual(self.memory_system.get_memory_summaries_by_tag("summary-view-retagged"), [])
+
+    def test_summary_view_tracks_reads_and_tag_order(self):
+        """Test summary counts follow read() and tag results keep view order."""
+        first_id = self.memory_system.add_note("Tag order first", tags=["tag-order-test"])
+        second_id = self.memory_system.add_note("Tag order second", tags=["tag-order-test"])
+        before = {s["id"]: s["retrieval_count"] for s in self.memory_system.get_memory_summaries()}
+
+        self.memory_system.read(first_id)
+        self.memory_system.read_multiple([first_id, second_id])
+
+        after = {s["id"]: s["retrieval_count"] for s in self.memory_system.get_memory_summaries()}
+        self.assertEqual(after[first_id], before[first_id] + 2)
+        self.assertEqual(after[second_id], before[second_id] + 1)
+
+        view_order = [s["id"] for s in self.memory_system.get_memory_summaries()
+                      if s["id"] in (first_id, second_id)]
+        for _ in range(3):
+            tagged = self.memory_system.get_memory_summaries_by_tag("tag-order-test")
+            self.assertEqual([s["id"] for s in tagged], view_order)
+
+        self.memory_system.delete(first_id)
+        self.memory_system.delete(second_id)
+
+    def test_reset_cache(self):
+        """Test reset_cache drops cached state and rereads from ChromaDB."""
+        memory_id = self.memory_system.add_note("Reset cache memory", tags=["reset-cache-tag"])
+        self.memory_system.read(memory_id)
+        self.memory_system.get_memory_summaries()
+        generation = self.memory_system.write_generation
+
+        self.memory_system.reset_cache()
+        self.assertEqual(self.memory_system.cache.get_stats()["size"], 0)
+        self.assertGreater(self.memory_system.write_generation, generation)
+
+        # Both the note and the summary view are rebuilt from ChromaDB
+        note = self.memory_system.read(memory_id)
+        self.assertEqual(note.content, "Reset cache memory")
+        tagged = self.memory_system.get_memory_summaries_by_tag("reset-cache-tag")
+        self.assertEqual([s["id"] for s in tagged], [memory_id])
+
+        self.memory_system.delete(memory_id)
+
+    def test_search_agentic_counts_returned_reads_only(self):
+        """Test that agentic search counts access on its hits but not on neighbors it cuts off."""
+        content = "Quantum annealing schedules for spin glass ground states"
+        hit_id = self.memory_system.add_note(content)
+        neighbor_id = self.memory_system.add_note("Sourdough hydration ratios for rye loaves")
+        self.memory_system.update(hit_id, links=[neighbor_id])
+        hit_count = self.memory_system.read(hit_id).retrieval_count
+        neighbor_count = self.memory_system.read(neighbor_id).retrieval_count
+
+        # k=1 leaves no room for neighbors, so the linked note must not be read
+        results = self.memory_system.search_agentic(content, k=1)
+        self.assertEqual([r["id"] for r in results], [hit_id])
+
+        # +1 for the search, +1 for the read() below
+        self.assertEqual(self.memory_system.read(hit_id).retrieval_count, hit_count + 2)
+        self.assertEqual(self.memory_system.read(neighbor_id).retrieval_count, neighbor_count + 1)
+
+        self.memory_system.delete(hit_id)
+        self.memory_system.delete(neighbor_id)
+
+    def test_embedding_backend_mismatch_refused(self):
+        """Test that reopening a collection with a different embedding backend fails loudly."""
+        from agentic_memory.retrievers import ChromaRetriever
+        client = self.memory_system.retriever.client
+        name = "test_backend_mismatch"
+        try:
+            retriever = ChromaRetriever(collection_name=name, embedding_backend="torch")
+            self.assertEqual(retriever.collection.metadata["embedding_backend"], "torch")
+            # Match our message; newer Chroma raises a bare ValueError on its own conflicts
+            with self.assertRaisesRegex(ValueError, "re-index"):
+                ChromaRetriever(collection_name=name, embedding_backend="onnx")
+            # Reopening with the original backend still works and keeps the stored metadata
+            reopened = ChromaRetriever(collection_name=name, embedding_backend="torch")
+            self.assertEqual(reopened.collection.metadata["embedding_backend"], "torch")
+        finally:
+            client.delete_collection(name)
+
 if __name__ == '__main__':
     unittest.main()
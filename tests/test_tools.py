@@ -0,0 +1,150 @@
+"""Tests for MCP tool helpers."""
+
+import json
+import unittest
+from collections import Counter
+from types import SimpleNamespace
+import numpy as np
+
+from agentic_memory_mcp.tools import SemanticQueryCache, register_tools
+
+
+class TestSemanticQueryCache(unittest.TestCase):
+    """Test exact and semantic search-result caching"""
+
+    def setUp(self):
+        self.cache = SemanticQueryCache(max_size=4, threshold=0.95)
+        self.cache.sync(0)
+        self.embedding = SemanticQueryCache.normalize([1.0, 0.0, 0.0])
+        self.results = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+        self.cache.put("memory evolution", 3, self.embedding, self.results)
+
+    def test_exact_hit(self):
+        """Test that an identical query and k is served without embedding"""
+        self.assertEqual(self.cache.get_exact("memory evolution", 3), self.results)
+        self.assertIsNone(self.cache.get_exact("memory evolution", 5))
+
+    def test_similar_query_hit_slices_results(self):
+        """Test that a near-identical query with a smaller k reuses cached results"""
+        nearby = SemanticQueryCache.normalize([0.99, 0.05, 0.0])
+        self.assertEqual(self.cache.get_similar(nearby, 2), self.results[:2])
+
+    def test_dissimilar_or_larger_k_misses(self):
+        """Test that unrelated queries and larger k are not served from cache"""
+        other = SemanticQueryCache.normalize([0.0, 1.0, 0.0])
+        self.assertIsNone(self.cache.get_similar(other, 3))
+        self.assertIsNone(self.cache.get_similar(self.embedding, 5))
+
+    def test_exact_k_only(self):
+        """Test that allow_larger_k=False requires the same k"""
+        cache = SemanticQueryCache(allow_larger_k=False)
+        cache.sync(0)
+        cache.put("q", 3, self.embedding, self.results)
+        self.assertIsNone(cache.get_similar(self.embedding, 2))
+        self.assertEqual(cache.get_similar(self.embedding, 3), self.results)
+
+    def test_write_generation_invalidates(self):
+        """Test that a store write drops every cached entry"""
+        self.cache.sync(1)
+        self.assertIsNone(self.cache.get_exact("memory evolution", 3))
+        self.assertIsNone(self.cache.get_similar(self.embedding, 3))
+
+
+class _FakeServer:
+    """Captures the handlers register_tools() installs."""
+
+    def list_tools(self):
+        return lambda fn: fn
+
+    def call_tool(self):
+        def decorator(fn):
+            self.call = fn
+            return fn
+        return decorator
+
+
+class _FakeMemorySystem:
+    """Counts vector searches and per-memory reads (what read() bookkeeping touches)."""
+
+    def __init__(self):
+        self.write_generation = 0
+        self.searches = 0
+        self.reads = Counter()
+        self.retriever = SimpleNamespace(embed_query=lambda query: [1.0, 0.0, 0.0])
+
+    def search(self, query, k=5, query_embedding=None):
+        self.searches += 1
+        self.reads.update(["a", "b"])
+        return [{"id": "a", "score": 0.1}, {"id": "b", "score": 0.2}][:k]
+
+    def search_agentic(self, query, k=5, query_embedding=None):
+        self.searches += 1
+        self.reads.update(["a", "n"])  # hits and returned neighbors go through read_multiple()
+        return [{"id": "a", "is_neighbor": False}, {"id": "n", "is_neighbor": True}][:k]
+
+    def read_multiple(self, memory_ids):
+        self.reads.update(memory_ids)
+        return {}
+
+
+class TestCachedSearchTools(unittest.IsolatedAsyncioTestCase):
+    """Test that search tool cache hits keep memory access bookkeeping"""
+
+    def setUp(self):
+        self.server = _FakeServer()
+        self.memory_system = _FakeMemorySystem()
+        register_tools(self.server, self.memory_system)
+
+    async def _call(self, name, arguments):
+        response = await self.server.call(name, arguments)
+        return json.loads(response[0].text)
+
+    async def test_search_hit_records_access(self):
+        """Test that a repeated search skips the vector search but still counts the reads"""
+        first = await self._call("search_memories", {"query": "memory evolution", "k": 2})
+        second = await self._call("search_memories", {"query": "memory evolution", "k": 2})
+
+        self.assertEqual(first["results"], second["results"])
+        self.assertEqual(self.memory_system.searches, 1)
+        self.assertEqual(self.memory_system.reads, Counter({"a": 2, "b": 2}))
+
+    async def test_agentic_hit_records_access(self):
+        """Test that an agentic cache hit touches the same memories as the uncached search"""
+        await self._call("search_memories_agentic", {"query": "memory evolution", "k": 2})
+        await self._call("search_memories_agentic", {"query": "memory evolution", "k": 2})
+
+        self.assertEqual(self.memory_system.searches, 1)
+        self.assertEqual(self.memory_system.reads, Counter({"a": 2, "n": 2}))
+
+    async def test_write_invalidates_cached_search(self):
+        """Test that a store write sends the next search back to ChromaDB"""
+        await self._call("search_memories", {"query": "memory evolution", "k": 2})
+        self.memory_system.write_generation += 1
+        await self._call("search_memories", {"query": "memory evolution", "k": 2})
+
+        self.assertEqual(self.memory_system.searches, 2)
+
+    async def test_bad_arguments_return_structured_errors(self):
+        """Test that mistyped k and ids are rejected before reaching the memory system"""
+        bad_calls = [
+            ("search_memories", {"query": "memory evolution", "k": "5"}),
+            ("search_memories", {"query": "memory evolution", "k": -1}),
+            ("search_memories_agentic", {"query": "memory evolution", "k": True}),
+            ("search_memories", {"k": 2}),
+            ("read_memory_note", {"memory_id": 42}),
+            ("read_memory_note", {"memory_ids": ["a", 7]}),
+            ("read_memory_note", {"memory_id": "a", "max_history": -2}),
+            ("delete_memory_note", {"memory_id": ["a"]}),
+        ]
+        for name, arguments in bad_calls:
+            with self.subTest(name=name, arguments=arguments):
+                result = await self._call(name, arguments)
+                self.assertEqual(result["status"], "error")
+                self.assertTrue(result["message"].startswith("Invalid arguments:"))
+
+        self.assertEqual(self.memory_system.searches, 0)
+        self.assertEqual(self.memory_system.reads, Counter())
+
+
+if __name__ == '__main__':
+    unittest.main()